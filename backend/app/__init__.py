@@ -2,4 +2,9 @@
 Fermix Backend Application
 FastAPI-based REST API for exoplanet classification
 """
+import time
+
 __version__ = "1.0.0"
+
+# Reference point for the startup-time report (see startup.py)
+IMPORT_STARTED = time.perf_counter()
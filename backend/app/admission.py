@@ -0,0 +1,195 @@
+"""
+Admission Control
+Bounded concurrency and load shedding per route group
+
+Heavy routes are grouped into lanes, each with an in-flight limit and a short
+bounded wait queue. When the queue is full (or a request waits too long) the
+request is rejected immediately with 503 + Retry-After instead of slowing
+every other request down. On-demand evaluation gets its own lane with one
+slot, since a refresh scores the whole held-out split. Health and stats
+routes sit in the priority lane, which is never limited; they stay
+responsive only as long as lane-limited handlers do their heavy work in the
+thread pool rather than on the event loop.
+
+Limits are per process: with N preforked workers (backend.app.serve) the
+server admits up to N times each configured in-flight and queue limit.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import settings
+
+
+class Lane:
+    """In-flight limit plus bounded wait queue for one route group"""
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    @property
+    def saturated(self) -> bool:
+        """All slots are taken and requests are waiting for one"""
+        return self.waiting > 0
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; False means the request should be shed"""
+        if self.semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected_queue_full += 1
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self.semaphore.acquire()
+
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "rejected": self.rejected_queue_full + self.rejected_timeout,
+        }
+
+
+def default_lanes() -> Dict[str, Lane]:
+    timeout = settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000
+    return {
+        "predict": Lane(
+            "predict",
+            settings.ADMISSION_PREDICT_MAX_IN_FLIGHT,
+            settings.ADMISSION_PREDICT_MAX_QUEUE,
+            timeout,
+        ),
+        "dataset": Lane(
+            "dataset",
+            settings.ADMISSION_DATASET_MAX_IN_FLIGHT,
+            settings.ADMISSION_DATASET_MAX_QUEUE,
+            timeout,
+        ),
+        "evaluation": Lane(
+            "evaluation",
+            settings.ADMISSION_EVALUATION_MAX_IN_FLIGHT,
+            settings.ADMISSION_EVALUATION_MAX_QUEUE,
+            timeout,
+        ),
+    }
+
+
+def default_routes() -> List[Tuple[str, str]]:
+    """(path prefix, lane) pairs, matched in order"""
+    prefix = settings.API_V1_PREFIX
+    return [
+        (f"{prefix}/predict", "predict"),
+        (f"{prefix}/similar", "predict"),
+        (f"{prefix}/dataset", "dataset"),
+        (f"{prefix}/crossmatch", "dataset"),
+        (f"{prefix}/evaluation", "evaluation"),
+    ]
+
+
+class AdmissionController:
+    """Maps request paths to lanes and keeps rejection counters"""
+
+    def __init__(self, lanes: Optional[Dict[str, Lane]] = None, routes: Optional[List[Tuple[str, str]]] = None):
+        self.lanes = lanes if lanes is not None else default_lanes()
+        self.routes = routes if routes is not None else default_routes()
+
+    def lane_for(self, path: str) -> Optional[Lane]:
+        """Lane limiting this path, or None for the unlimited priority lane"""
+        for prefix, lane in self.routes:
+            if path.startswith(prefix):
+                return self.lanes.get(lane)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_pid": os.getpid(),
+            "enabled": settings.ADMISSION_ENABLED,
+            "retry_after_seconds": settings.ADMISSION_RETRY_AFTER_SECONDS,
+            "lanes": {name: lane.stats() for name, lane in self.lanes.items()},
+            "rejected_total": sum(lane.rejected_queue_full + lane.rejected_timeout for lane in self.lanes.values()),
+        }
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying AdmissionController to HTTP requests"""
+
+    def __init__(self, app, controller: "AdmissionController"):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.controller.lane_for(scope["path"])
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Arrival time (request.state.arrived_at): queue wait counts against latency budgets
+        scope.setdefault("state", {})["arrived_at"] = time.perf_counter()
+        if not await lane.acquire():
+            await self._reject(send, lane)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
+
+    @staticmethod
+    async def _reject(send, lane: Lane):
+        body = json.dumps({"detail": f"Server busy ({lane.name} queue full). Retry shortly."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# Create global admission controller instance
+admission_controller = AdmissionController()
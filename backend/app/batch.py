@@ -0,0 +1,254 @@
+"""
+Columnar Batch Inputs
+Decoding, vectorized validation and encoding for /predict/batch
+
+Batches arrive column-wise instead of as one JSON object per row:
+- application/json: {"model_type": "lgbm", "columns": {"koi_period": [...], ...}}
+- application/vnd.apache.arrow.stream: Arrow IPC stream (requires pyarrow)
+- application/msgpack: same map as the JSON body (requires msgpack)
+
+Each column is checked once against the constraints declared on
+PredictionInput (required fields, gt=0 bounds, integer flags) instead of
+validating every row as a separate pydantic object.
+"""
+import importlib
+import json
+import operator
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, get_args
+
+from .schemas import PredictionInput
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+JSON_TYPE = "application/json"
+ARROW_TYPES = ("application/vnd.apache.arrow.stream", "application/vnd.apache.arrow.file")
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+
+FORMAT_MEDIA_TYPES = {
+    "json": JSON_TYPE,
+    "arrow": ARROW_TYPES[0],
+    "msgpack": MSGPACK_TYPES[0],
+}
+
+# PredictionInput fields that are request options rather than features
+NON_FEATURE_FIELDS = {"model_type", "similar_k", "latency_budget_ms"}
+
+
+class BatchFormatError(ValueError):
+    """Body could not be decoded in the declared format"""
+
+
+class BatchValidationError(ValueError):
+    """One or more columns violate PredictionInput constraints"""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid column(s)")
+
+
+def _require(module: str):
+    """Import an optional codec dependency"""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise BatchFormatError(f"{module.split('.')[0]} is not installed on the server; use JSON columns instead")
+
+
+# ==================== Decoding ====================
+
+def format_for_media_type(content_type: Optional[str]) -> str:
+    """Map a Content-Type value to json, arrow or msgpack"""
+    media_type = (content_type or JSON_TYPE).split(";")[0].strip().lower()
+    if media_type in ARROW_TYPES:
+        return "arrow"
+    if media_type in MSGPACK_TYPES:
+        return "msgpack"
+    if media_type in (JSON_TYPE, "*/*", ""):
+        return "json"
+    raise BatchFormatError(f"Unsupported media type: {media_type}")
+
+
+def format_for_accept(accept: Optional[str]) -> str:
+    """
+    Response format for an Accept header listing one or more media types
+    The first supported type wins (*/* and application/* count as json);
+    q-values are ignored and json is the fallback.
+    """
+    for value in (accept or "").split(","):
+        media_type = value.split(";")[0].strip().lower()
+        if media_type in ARROW_TYPES:
+            return "arrow"
+        if media_type in MSGPACK_TYPES:
+            return "msgpack"
+        if media_type in (JSON_TYPE, "*/*", "application/*"):
+            return "json"
+    return "json"
+
+
+def decode_batch(body: bytes, content_type: Optional[str]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Decode a columnar batch body
+
+    Returns:
+        (columns, model_type) - model_type is None when the body does not carry one
+    """
+    fmt = format_for_media_type(content_type)
+    try:
+        if fmt == "arrow":
+            ipc = _require("pyarrow.ipc")
+            if content_type.split(";")[0].strip().lower() == ARROW_TYPES[1]:
+                table = ipc.open_file(body).read_all()
+            else:
+                table = ipc.open_stream(body).read_all()
+            return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}, None
+
+        if fmt == "msgpack":
+            msgpack = _require("msgpack")
+            payload = msgpack.unpackb(body, raw=False)
+        else:
+            payload = json.loads(body)
+    except BatchFormatError:
+        raise
+    except Exception as e:
+        raise BatchFormatError(f"Could not decode {fmt} body: {e}")
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("columns"), dict):
+        raise BatchFormatError('Body must be an object with a "columns" map of column name → values')
+    return payload["columns"], payload.get("model_type")
+
+
+# ==================== Validation ====================
+
+def _column_constraints() -> Dict[str, Dict[str, Any]]:
+    """Constraints declared on PredictionInput, keyed by feature name"""
+    constraints = {}
+    for name, field in PredictionInput.model_fields.items():
+        if name in NON_FEATURE_FIELDS:
+            continue
+        annotation = field.annotation
+        rule = {"required": field.is_required(), "integer": annotation is int or int in get_args(annotation)}
+        for meta in field.metadata:
+            for bound in ("gt", "ge", "lt", "le"):
+                if getattr(meta, bound, None) is not None:
+                    rule[bound] = getattr(meta, bound)
+        constraints[name] = rule
+    return constraints
+
+
+COLUMN_CONSTRAINTS = _column_constraints()
+
+# Elementwise on numpy arrays
+_BOUND_CHECKS = {
+    "gt": (operator.gt, "greater than"),
+    "ge": (operator.ge, "greater than or equal to"),
+    "lt": (operator.lt, "less than"),
+    "le": (operator.le, "less than or equal to"),
+}
+
+
+def _bad_rows(mask: "np.ndarray", limit: int = 5) -> List[int]:
+    return mask.nonzero()[0][:limit].tolist()
+
+
+def validate_columns(columns: Dict[str, Any], features: List[str], max_rows: int) -> "pd.DataFrame":
+    """
+    Validate columns with one vectorized check per constraint
+
+    Args:
+        columns: Column name → sequence of values
+        features: Model feature names; other columns are ignored
+        max_rows: Upper bound on batch size
+
+    Returns:
+        Float DataFrame with the provided feature columns (NaN = missing)
+    """
+    import numpy as np
+    import pandas as pd
+
+    errors: List[Dict[str, Any]] = []
+    known = set(features) | set(COLUMN_CONSTRAINTS)
+    provided = {name: values for name, values in columns.items() if name in known}
+
+    scalars = [name for name, values in provided.items() if isinstance(values, (str, bytes)) or not hasattr(values, "__len__")]
+    if scalars:
+        raise BatchValidationError([{"column": name, "error": "column must be an array"} for name in scalars])
+
+    lengths = {name: len(values) for name, values in provided.items()}
+    n_rows = next(iter(lengths.values()), 0)
+    if len(set(lengths.values())) > 1:
+        raise BatchValidationError([{"column": None, "error": f"columns have different lengths: {lengths}"}])
+    if n_rows == 0:
+        raise BatchValidationError([{"column": None, "error": "batch is empty"}])
+    if n_rows > max_rows:
+        raise BatchValidationError([{"column": None, "error": f"batch has {n_rows} rows, maximum is {max_rows}"}])
+
+    data = {}
+    for name, values in provided.items():
+        raw = pd.Series(values)
+        numeric = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float64)
+        not_numeric = np.isnan(numeric) & raw.notna().to_numpy()
+        if not_numeric.any():
+            errors.append({"column": name, "error": "values must be numeric", "rows": _bad_rows(not_numeric)})
+        data[name] = numeric
+
+    for name, rule in COLUMN_CONSTRAINTS.items():
+        values = data.get(name)
+        if values is None:
+            if rule["required"]:
+                errors.append({"column": name, "error": "column is required"})
+            continue
+
+        missing = np.isnan(values)
+        if rule["required"] and missing.any():
+            errors.append({"column": name, "error": "value is required", "rows": _bad_rows(missing)})
+
+        present = ~missing
+        for bound, (check, label) in _BOUND_CHECKS.items():
+            if bound in rule:
+                failed = present & ~check(values, rule[bound])
+                if failed.any():
+                    errors.append({"column": name, "error": f"must be {label} {rule[bound]}", "rows": _bad_rows(failed)})
+
+        if rule["integer"]:
+            fractional = present & (np.floor(np.where(present, values, 0.0)) != values)
+            if fractional.any():
+                errors.append({"column": name, "error": "values must be integers", "rows": _bad_rows(fractional)})
+
+    if errors:
+        raise BatchValidationError(errors)
+
+    return pd.DataFrame(data)
+
+
+# ==================== Encoding ====================
+
+def encode_result(result: Dict[str, Any], fmt: str) -> bytes:
+    """
+    Encode a columnar prediction result
+
+    Args:
+        result: {"model_used": str, "n_rows": int, "columns": {name: np.ndarray}}
+        fmt: json, arrow or msgpack
+    """
+    if fmt == "arrow":
+        pa = _require("pyarrow")
+        ipc = _require("pyarrow.ipc")
+        table = pa.table(result["columns"]).replace_schema_metadata(
+            {"model_used": result["model_used"], "n_rows": str(result["n_rows"])}
+        )
+        sink = pa.BufferOutputStream()
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    payload = {
+        "model_used": result["model_used"],
+        "n_rows": result["n_rows"],
+        "columns": {name: values.tolist() for name, values in result["columns"].items()},
+    }
+    if fmt == "msgpack":
+        return _require("msgpack").packb(payload, use_bin_type=True)
+    return json.dumps(payload).encode()
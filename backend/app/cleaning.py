@@ -0,0 +1,284 @@
+"""
+Incremental Data Cleaning
+Chunked replacement for the export step of notebooks/01_cleaning.ipynb
+
+Raw NASA Exoplanet Archive exports (data/raw/<name>.csv) are read in chunks,
+projected onto the cleaned schema and compared against a per-row hash index
+stored in data/clean/.state/. Only rows that are new or whose content changed
+since the last run are appended to data/clean/<name>_clean.csv, so a daily
+archive refresh costs time in proportion to the number of changed rows.
+
+Usage (from project root):
+    python -m backend.app.cleaning                 # all sources found in data/raw
+    python -m backend.app.cleaning tess --full     # rebuild one source from scratch
+    python -m backend.app.cleaning kepler --compact
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .config import settings
+
+
+# Raw archive exports and the column identifying a source row across releases.
+# Sources without a stable key are content-addressed: every distinct row is
+# appended once, and an edited row shows up as a new one.
+RAW_SOURCES: Dict[str, Dict[str, Any]] = {
+    "kepler": {"raw": "kepler.csv", "key": "kepoi_name"},
+    "k2": {"raw": "k2.csv", "key": None},
+    "tess": {"raw": "tess.csv", "key": "toi"},
+}
+
+STATE_DIR_NAME = settings.CLEAN_STATE_DIR.name
+
+
+class IncrementalCleaner:
+    """Cleans one raw archive export into data/clean/<name>_clean.csv"""
+
+    def __init__(
+        self,
+        name: str,
+        raw_path: Optional[Path] = None,
+        key: Optional[str] = None,
+        clean_dir: Optional[Path] = None,
+        chunk_size: Optional[int] = None,
+        missing_threshold: Optional[float] = None,
+    ):
+        source = RAW_SOURCES.get(name, {})
+        self.name = name
+        self.raw_path = Path(raw_path or settings.RAW_DATA_DIR / source.get("raw", f"{name}.csv"))
+        self.key = key if key is not None else source.get("key")
+        self.clean_dir = Path(clean_dir or settings.CLEAN_DATA_DIR)
+        self.chunk_size = chunk_size or settings.CLEAN_CHUNK_SIZE
+        self.missing_threshold = (
+            missing_threshold if missing_threshold is not None else settings.CLEAN_MISSING_THRESHOLD
+        )
+
+        self.clean_path = self.clean_dir / f"{name}_clean.csv"
+        self.state_dir = self.clean_dir / STATE_DIR_NAME
+        self.meta_path = self.state_dir / f"{name}.json"
+        self.index_path = self.state_dir / f"{name}_index.csv"
+
+    # ==================== Reading ====================
+
+    def _read_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Stream the raw export as strings
+        Values are kept verbatim so row hashes are stable between releases
+        regardless of how pandas would infer dtypes for a given chunk.
+        """
+        return pd.read_csv(
+            self.raw_path,
+            comment='#',
+            on_bad_lines='skip',
+            dtype=str,
+            keep_default_na=False,
+            chunksize=self.chunk_size,
+        )
+
+    @staticmethod
+    def _transform(chunk: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """Project onto the cleaned schema and normalise whitespace"""
+        chunk = chunk.reindex(columns=columns, fill_value="")
+        return chunk.apply(lambda col: col.str.strip())
+
+    def _infer_schema(self) -> List[str]:
+        """
+        Keep columns with less than missing_threshold % empty values
+        Same rule as clean_dataset() in the notebook, accumulated chunk by chunk.
+        """
+        missing = None
+        total = 0
+        for chunk in self._read_chunks():
+            counts = (chunk.apply(lambda col: col.str.strip()) == "").sum()
+            missing = counts if missing is None else missing.add(counts, fill_value=0)
+            total += len(chunk)
+
+        if missing is None:
+            return []
+
+        missing_pct = missing / max(total, 1) * 100
+        return [col for col in missing.index if missing_pct[col] < self.missing_threshold]
+
+    def _row_keys(self, frame: pd.DataFrame, hashes: pd.Series) -> pd.Series:
+        """Source row identity: the key column, or the content hash"""
+        if self.key and self.key in frame.columns:
+            return frame[self.key]
+        return hashes.astype(str)
+
+    # ==================== State ====================
+
+    def _fingerprint(self) -> Dict[str, int]:
+        stat = self.raw_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _load_meta(self) -> Optional[Dict[str, Any]]:
+        if not self.meta_path.exists():
+            return None
+        with open(self.meta_path, 'r') as f:
+            return json.load(f)
+
+    def _load_index(self) -> pd.Series:
+        if not self.index_path.exists():
+            return pd.Series(dtype='uint64')
+        index = pd.read_csv(self.index_path, dtype={"key": str, "hash": "uint64"}, keep_default_na=False)
+        return pd.Series(index["hash"].values, index=index["key"].values, dtype='uint64')
+
+    def _save_state(self, meta: Dict[str, Any], index: pd.Series):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({"key": index.index, "hash": index.values}).to_csv(self.index_path, index=False)
+        with open(self.meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    # ==================== Pipeline ====================
+
+    def run(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Append new or changed rows from the raw export to the clean dataset
+
+        Args:
+            full: Ignore recorded state and rebuild the clean file from scratch
+
+        Returns:
+            Summary with rows scanned/appended and elapsed seconds
+        """
+        if not self.raw_path.exists():
+            raise FileNotFoundError(f"Raw export not found: {self.raw_path}")
+
+        start = time.perf_counter()
+        meta = self._load_meta()
+        fingerprint = self._fingerprint()
+        rebuild = full or meta is None or not self.clean_path.exists()
+
+        if not rebuild and meta.get("fingerprint") == fingerprint:
+            return self._summary(mode="unchanged", scanned=0, appended=0, start=start)
+
+        if rebuild:
+            columns = self._infer_schema()
+            index = pd.Series(dtype='uint64')
+            self.clean_dir.mkdir(parents=True, exist_ok=True)
+            pd.DataFrame(columns=columns).to_csv(self.clean_path, index=False)
+        else:
+            # Schema is frozen after the first build so appended rows line up
+            # with the existing header; columns dropped by the archive are left empty.
+            columns = meta["columns"]
+            index = self._load_index()
+
+        scanned = 0
+        appended = 0
+        updates = []
+
+        for chunk in self._read_chunks():
+            scanned += len(chunk)
+            chunk = self._transform(chunk, columns)
+            hashes = pd.util.hash_pandas_object(chunk, index=False)
+            keys = self._row_keys(chunk, hashes)
+
+            # Within a chunk, the last occurrence of a key wins
+            latest = ~keys.duplicated(keep='last').values
+            chunk, hashes, keys = chunk[latest], hashes[latest], keys[latest]
+
+            known = keys.isin(index.index).values
+            fresh = ~known
+            if known.any():
+                previous = index.loc[keys.values[known]].values
+                fresh[known] = previous != hashes.values[known]
+
+            if fresh.any():
+                chunk[fresh].to_csv(self.clean_path, mode='a', header=False, index=False)
+                updates.append(pd.Series(hashes.values[fresh], index=keys.values[fresh], dtype='uint64'))
+                appended += int(fresh.sum())
+
+        if updates:
+            index = pd.concat([index] + updates)
+            index = index[~index.index.duplicated(keep='last')]
+
+        # State is written after the data: an interrupted run re-appends the
+        # same rows next time, which load_clean() collapses by key.
+        self._save_state(
+            {
+                "name": self.name,
+                "raw_path": str(self.raw_path),
+                "key": self.key,
+                "columns": columns,
+                "fingerprint": fingerprint,
+                "rows_tracked": int(len(index)),
+                "updated_utc": pd.Timestamp.now(tz="UTC").isoformat(),
+            },
+            index,
+        )
+
+        return self._summary(mode="full" if rebuild else "incremental", scanned=scanned, appended=appended, start=start)
+
+    def compact(self) -> int:
+        """Rewrite the clean file keeping only the latest row per key"""
+        df = load_clean(self.name, clean_dir=self.clean_dir)
+        df.to_csv(self.clean_path, index=False)
+        return len(df)
+
+    def _summary(self, mode: str, scanned: int, appended: int, start: float) -> Dict[str, Any]:
+        return {
+            "dataset": self.name,
+            "mode": mode,
+            "rows_scanned": scanned,
+            "rows_appended": appended,
+            "clean_path": str(self.clean_path),
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+
+
+def load_clean(name: str, clean_dir: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Load a cleaned dataset, dropping rows superseded by later appends
+    Falls back to the plain CSV for datasets not produced by the pipeline.
+    """
+    cleaner = IncrementalCleaner(name, clean_dir=clean_dir)
+    df = pd.read_csv(cleaner.clean_path)
+    key = dedupe_key(name, clean_dir=clean_dir)
+    if key and key in df.columns:
+        df = df.drop_duplicates(subset=[key], keep='last').reset_index(drop=True)
+    return df
+
+
+def dedupe_key(name: str, clean_dir: Optional[Path] = None) -> Optional[str]:
+    """Key column whose last occurrence wins in a pipeline-built clean file"""
+    meta = IncrementalCleaner(name, clean_dir=clean_dir)._load_meta()
+    return meta.get("key") if meta else None
+
+
+def available_sources() -> List[str]:
+    """Names of raw exports present under RAW_DATA_DIR"""
+    return [name for name, source in RAW_SOURCES.items() if (settings.RAW_DATA_DIR / source["raw"]).exists()]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Incrementally clean raw NASA archive exports")
+    parser.add_argument("datasets", nargs="*", help=f"Sources to clean (default: all present in {settings.RAW_DATA_DIR})")
+    parser.add_argument("--full", action="store_true", help="Rebuild from scratch, ignoring recorded state")
+    parser.add_argument("--compact", action="store_true", help="Collapse superseded rows after cleaning")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Rows per chunk")
+    args = parser.parse_args(argv)
+
+    names = args.datasets or available_sources()
+    if not names:
+        print(f"⚠️  No raw exports found in {settings.RAW_DATA_DIR}")
+        return
+
+    for name in names:
+        cleaner = IncrementalCleaner(name, chunk_size=args.chunk_size)
+        summary = cleaner.run(full=args.full)
+        print(
+            f"✓ {name}: {summary['mode']} - {summary['rows_appended']:,} of "
+            f"{summary['rows_scanned']:,} rows appended in {summary['elapsed_seconds']}s"
+        )
+        if args.compact:
+            rows = cleaner.compact()
+            print(f"  - compacted to {rows:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ Uses Pydantic Settings for environment variable management
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 from pathlib import Path
-from typing import List, Union
+from typing import List, Optional, Union
 
 
 class Settings(BaseSettings):
@@ -43,6 +43,8 @@ class Settings(BaseSettings):
     DATA_DIR: Path = BASE_DIR / "data"
     SAMPLE_DATA_DIR: Path = DATA_DIR / "sample"
     CLEAN_DATA_DIR: Path = DATA_DIR / "clean"
+    RAW_DATA_DIR: Path = DATA_DIR / "raw"
+    CLEAN_STATE_DIR: Path = CLEAN_DATA_DIR / ".state"
     
     # Model files
     RF_MODEL_PATH: Path = MODELS_DIR / "model_rf.pkl"
@@ -50,14 +52,102 @@ class Settings(BaseSettings):
     METADATA_PATH: Path = MODELS_DIR / "metadata.json"
     FEATURES_PATH: Path = MODELS_DIR / "features.json"
     
+    # Incremental LightGBM updates (python -m backend.app.model_update)
+    MODEL_UPDATE_STATE_PATH: Path = MODELS_DIR / "update_state.json"
+    MODEL_ARCHIVE_DIR: Path = MODELS_DIR / "archive"
+    MODEL_UPDATE_ROUNDS: int = 50
+    MODEL_UPDATE_LEARNING_RATE: Optional[float] = None  # default: the current model's
+    MODEL_UPDATE_MAX_METRIC_DROP: float = 0.002  # max held-out ROC/PR-AUC loss to publish
+    MODEL_UPDATE_MIN_ROWS: int = 20
+    MODEL_UPDATE_MIN_CHILD_SAMPLES: int = 5  # leaf minimum for update rounds (training's is 20)
+    
+    # RandomForest early exit (stop evaluating trees once the class is settled).
+    # Opt-in: rf probabilities become means over the trees evaluated, not the full forest
+    RF_EARLY_EXIT_ENABLED: bool = False
+    RF_EARLY_EXIT_BATCH_SIZE: int = 25  # trees between stopping checks
+    RF_EARLY_EXIT_TOLERANCE: float = 0.001  # max chance the remaining trees flip the class
+    
+    # Automatic model selection (model_type "auto" with a latency budget)
+    AUTO_DEFAULT_BUDGET_MS: float = 100.0
+    AUTO_STATS_WINDOW_SECONDS: float = 60.0  # older latency samples are dropped, so models get re-measured
+    AUTO_MIN_SAMPLES: int = 5
+    
+    # Shadow evaluation (candidate model scored on sampled /predict traffic)
+    SHADOW_MODEL_PATH: Optional[Path] = None
+    SHADOW_SAMPLE_RATE: float = 0.1
+    SHADOW_QUEUE_SIZE: int = 256  # pending shadow jobs; further samples are dropped
+    
     # Dataset
     SAMPLE_DATASET_PATH: Path = SAMPLE_DATA_DIR / "kepler_sample.csv"
     CLEAN_DATASET_PATH: Path = CLEAN_DATA_DIR / "kepler_clean.csv"
+
+    # Cleaning pipeline
+    CLEAN_CHUNK_SIZE: int = 5000
+    CLEAN_MISSING_THRESHOLD: float = 95.0  # drop columns with >= this % missing
+
+    # Dataset registry
+    DATASET_MEMORY_BUDGET_MB: int = 512  # loaded datasets and their indexes are evicted LRU beyond this
+    
+    # Similar candidates index
+    SIMILARITY_DATASET: Optional[str] = None  # default: "kepler" if cleaned, else "kepler_sample"
+    SIMILARITY_LEAF_SIZE: int = 40
+    SIMILARITY_MAX_K: int = 50
+    
+    # Sky cross-match (unit-vector KD-trees over ra/dec)
+    CROSSMATCH_LEAF_SIZE: int = 40
+    CROSSMATCH_MAX_RADIUS_ARCSEC: float = 3600.0
+    
+    # Batch scoring
+    BATCH_MAX_ROWS: int = 100000
+    
+    # Held-out evaluation
+    EVALUATION_DATASET: Optional[str] = None  # default: "kepler" if cleaned, else "kepler_sample"
+    EVALUATION_CURVE_POINTS: int = 200  # max points per ROC/PR/threshold curve
+    EVALUATION_CALIBRATION_BINS: int = 10
+    
+    # Prediction log (row-bounded buffer drained by a background writer)
+    PREDICTION_LOG_ENABLED: bool = True
+    PREDICTION_LOG_DIR: Path = BASE_DIR / "logs" / "predictions"
+    PREDICTION_LOG_BUFFER_SIZE: int = 10000  # rows; oldest entries are dropped beyond this
+    PREDICTION_LOG_FLUSH_ROWS: int = 1000
+    PREDICTION_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    PREDICTION_LOG_MAX_FILE_MB: int = 64
+    
+    # What-if sweeps (grid points scored per request)
+    SWEEP_MAX_POINTS: int = 10000
+    
+    # Dataset export (rows read and encoded per chunk)
+    EXPORT_CHUNK_SIZE: int = 10000
+    
+    # Admission control (per route group: bounded in-flight + bounded wait queue)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_PREDICT_MAX_IN_FLIGHT: int = 8
+    ADMISSION_PREDICT_MAX_QUEUE: int = 32
+    ADMISSION_DATASET_MAX_IN_FLIGHT: int = 4
+    ADMISSION_DATASET_MAX_QUEUE: int = 16
+    ADMISSION_EVALUATION_MAX_IN_FLIGHT: int = 1
+    ADMISSION_EVALUATION_MAX_QUEUE: int = 4
+    ADMISSION_QUEUE_TIMEOUT_MS: int = 2000
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    
+    # Input monitoring (per-feature quantile sketches)
+    MONITORING_ENABLED: bool = True
+    MONITORING_RELATIVE_ACCURACY: float = 0.01
+    MONITORING_MAX_BINS: int = 2048  # per sign; covers ~e^40 dynamic range at 1% accuracy
     
     # Pagination
     DEFAULT_PAGE_SIZE: int = 50
     MAX_PAGE_SIZE: int = 500
     
+    # Startup: load models after the server starts accepting connections;
+    # prediction requests wait up to MODEL_LOAD_WAIT_SECONDS for them
+    MODEL_LOAD_IN_BACKGROUND: bool = True
+    MODEL_LOAD_WAIT_SECONDS: float = 30.0
+    
+    # Serving (python -m backend.app.serve)
+    WORKERS: Optional[int] = None  # default: WEB_CONCURRENCY, else CPUs allowed by affinity and cgroup quota
+    WEB_CONCURRENCY: Optional[int] = None  # worker count set by hosting platforms
+    
     # Model Selection
     DEFAULT_MODEL: str = "lgbm"  # or "rf"
     
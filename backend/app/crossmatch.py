@@ -0,0 +1,293 @@
+"""
+Sky Cross-Match Index
+Cone searches and catalog-to-catalog matching on ra/dec
+
+Each dataset with ra/dec columns gets a KD-tree over its positions as unit
+vectors on the sphere, built when the registry loads the dataset. An angular
+radius θ is the straight-line (chord) distance 2·sin(θ/2) between unit
+vectors, so a cone search is one radius query and a cross-match is one
+batched radius query of every source position against the target tree,
+instead of a pairwise scan. Chord distance has no RA wrap-around or pole
+singularities.
+"""
+import json
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .config import settings
+from .datasets import DatasetRegistry, dataset_registry, index_memory
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+RA_COLUMN = "ra"
+DEC_COLUMN = "dec"
+
+# Identifier columns returned with each position (when present in the dataset)
+ID_COLUMNS = [
+    "kepoi_name",
+    "kepid",
+    "kepler_name",
+    "koi_disposition",
+    "toi",
+    "tid",
+    "tfopwg_disp",
+]
+
+ARCSEC_PER_RADIAN = math.degrees(1) * 3600
+
+
+def unit_vectors(ra: "np.ndarray", dec: "np.ndarray") -> "np.ndarray":
+    """(n, 3) Cartesian unit vectors for positions in degrees"""
+    import numpy as np
+
+    ra = np.radians(ra)
+    dec = np.radians(dec)
+    cos_dec = np.cos(dec)
+    return np.column_stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)])
+
+
+def chord_length(radius_arcsec: float) -> float:
+    """Unit-vector distance spanning an angular radius"""
+    import numpy as np
+
+    return float(2 * np.sin(radius_arcsec / ARCSEC_PER_RADIAN / 2))
+
+
+def separation_arcsec(chord: "np.ndarray") -> "np.ndarray":
+    """Angular separation for unit-vector distances"""
+    import numpy as np
+
+    return 2 * np.arcsin(np.minimum(chord / 2, 1.0)) * ARCSEC_PER_RADIAN
+
+
+class _SkyState:
+    """Immutable snapshot of one dataset's index, swapped in atomically on rebuild"""
+
+    def __init__(self, dataset: str, version: str, tree: Any, xyz: "np.ndarray",
+                 rows: List[Dict[str, Any]], skipped: int, build_seconds: float):
+        self.dataset = dataset
+        self.version = version
+        self.tree = tree
+        self.xyz = xyz
+        self.rows = rows
+        self.skipped = skipped
+        self.build_seconds = build_seconds
+        self.resident_bytes = index_memory(tree, rows, xyz)
+
+
+class SkyIndex:
+    """Per-dataset unit-vector KD-trees, rebuilt when a dataset's version changes"""
+
+    def __init__(self, registry: DatasetRegistry):
+        self.registry = registry
+        self._states: Dict[str, _SkyState] = {}
+        self._build_lock = threading.Lock()
+        self.builds = 0
+        self.cone_searches = 0
+        self.cross_matches = 0
+
+    # ==================== Building ====================
+
+    def on_dataset_loaded(self, name: str, frame: "pd.DataFrame", version: str):
+        """Registry listener: index every dataset that carries sky positions"""
+        if RA_COLUMN in frame.columns and DEC_COLUMN in frame.columns:
+            self._build(name, frame, version)
+
+    def on_dataset_unloaded(self, name: str):
+        """Registry listener: drop a dataset's index when it is evicted"""
+        self._states.pop(name, None)
+
+    def index_bytes(self, name: str) -> int:
+        state = self._states.get(name)
+        return state.resident_bytes if state is not None else 0
+
+    def _build(self, name: str, frame: "pd.DataFrame", version: str):
+        import numpy as np
+        import pandas as pd
+        from sklearn.neighbors import KDTree
+
+        with self._build_lock:
+            state = self._states.get(name)
+            if state is not None and state.version == version:
+                return
+
+            start = time.perf_counter()
+            ra = pd.to_numeric(frame[RA_COLUMN], errors='coerce').to_numpy(dtype=np.float64)
+            dec = pd.to_numeric(frame[DEC_COLUMN], errors='coerce').to_numpy(dtype=np.float64)
+            valid = np.isfinite(ra) & np.isfinite(dec) & (np.abs(dec) <= 90)
+            xyz = unit_vectors(ra[valid], dec[valid])
+            tree = KDTree(xyz, leaf_size=settings.CROSSMATCH_LEAF_SIZE)
+
+            columns = [col for col in ID_COLUMNS if col in frame.columns] + [RA_COLUMN, DEC_COLUMN]
+            rows = json.loads(frame.loc[valid, columns].to_json(orient='records'))
+            # Position in the dataset, as used by /dataset offsets
+            for row, position in zip(rows, np.flatnonzero(valid).tolist()):
+                row["row"] = position
+
+            self._states[name] = _SkyState(
+                dataset=name,
+                version=version,
+                tree=tree,
+                xyz=xyz,
+                rows=rows,
+                skipped=int((~valid).sum()),
+                build_seconds=time.perf_counter() - start,
+            )
+            self.builds += 1
+            print(f"✓ Sky index built: {name} ({len(rows):,} positions, {self._states[name].build_seconds:.2f}s)")
+
+    def ensure(self, name: str) -> _SkyState:
+        """
+        Return a current index for a dataset, building it if needed
+        Touching the dataset through the registry reloads it when the file
+        changed, which fires on_dataset_loaded and rebuilds the index.
+        """
+        frame = self.registry.get(name)
+        version = self.registry.entries[name].version
+        state = self._states.get(name)
+        if state is None or state.version != version:
+            if RA_COLUMN not in frame.columns or DEC_COLUMN not in frame.columns:
+                raise ValueError(f"Dataset '{name}' has no {RA_COLUMN}/{DEC_COLUMN} columns")
+            self._build(name, frame, version)
+            state = self._states[name]
+        return state
+
+    # ==================== Querying ====================
+
+    @staticmethod
+    def _check_radius(radius_arcsec: float):
+        if not 0 < radius_arcsec <= settings.CROSSMATCH_MAX_RADIUS_ARCSEC:
+            raise ValueError(f"radius_arcsec must be in (0, {settings.CROSSMATCH_MAX_RADIUS_ARCSEC}]")
+
+    def cone_search(self, dataset: str, ra: float, dec: float, radius_arcsec: float,
+                    limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Rows of a dataset within radius_arcsec of (ra, dec), nearest first
+
+        Args:
+            dataset: Dataset with ra/dec columns
+            ra: Right ascension in degrees
+            dec: Declination in degrees
+            radius_arcsec: Cone radius
+            limit: Maximum matches returned (count still reports all)
+        """
+        import numpy as np
+
+        self._check_radius(radius_arcsec)
+        if not -90 <= dec <= 90:
+            raise ValueError("dec must be in [-90, 90]")
+        state = self.ensure(dataset)
+
+        center = unit_vectors(np.array([ra]), np.array([dec]))
+        indices, distances = state.tree.query_radius(
+            center, chord_length(radius_arcsec), return_distance=True, sort_results=True
+        )
+        self.cone_searches += 1
+
+        separations = separation_arcsec(distances[0])
+        matches = [
+            {**state.rows[idx], "separation_arcsec": float(sep)}
+            for idx, sep in zip(indices[0][:limit], separations[:limit])
+        ]
+        return {
+            "dataset": dataset,
+            "version": state.version,
+            "ra": ra,
+            "dec": dec,
+            "radius_arcsec": radius_arcsec,
+            "count": int(len(indices[0])),
+            "matches": matches,
+        }
+
+    def cross_match(self, source: str, target: str, radius_arcsec: float,
+                    nearest_only: bool = True, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Pairs of source and target rows within radius_arcsec of each other
+
+        Args:
+            source: Dataset whose positions are looked up
+            target: Dataset searched around each source position
+            radius_arcsec: Match radius
+            nearest_only: Keep only the closest target per source row
+            limit: Maximum pairs returned (count still reports all)
+
+        Returns:
+            Pairs ordered by source row, then separation
+        """
+        import numpy as np
+
+        self._check_radius(radius_arcsec)
+        start = time.perf_counter()
+        source_state = self.ensure(source)
+        target_state = self.ensure(target)
+        chord = chord_length(radius_arcsec)
+
+        if nearest_only:
+            distances, indices = target_state.tree.query(source_state.xyz, k=1)
+            hit = distances[:, 0] <= chord
+            source_idx = np.flatnonzero(hit)
+            target_idx = indices[hit, 0]
+            chords = distances[hit, 0]
+        else:
+            neighbours, distances = target_state.tree.query_radius(
+                source_state.xyz, chord, return_distance=True, sort_results=True
+            )
+            counts = np.fromiter((len(n) for n in neighbours), dtype=np.int64, count=len(neighbours))
+            source_idx = np.repeat(np.arange(len(neighbours)), counts)
+            target_idx = np.concatenate(neighbours) if len(neighbours) else np.empty(0, dtype=np.int64)
+            chords = np.concatenate(distances) if len(distances) else np.empty(0)
+        self.cross_matches += 1
+
+        separations = separation_arcsec(chords)
+        pairs = [
+            {
+                "source": source_state.rows[s],
+                "target": target_state.rows[t],
+                "separation_arcsec": float(sep),
+            }
+            for s, t, sep in zip(source_idx[:limit].tolist(), target_idx[:limit].tolist(), separations[:limit])
+        ]
+        return {
+            "source": source,
+            "source_version": source_state.version,
+            "target": target,
+            "target_version": target_state.version,
+            "radius_arcsec": radius_arcsec,
+            "nearest_only": nearest_only,
+            "source_rows": len(source_state.rows),
+            "matched_source_rows": int(len(np.unique(source_idx))),
+            "count": int(len(source_idx)),
+            "pairs": pairs,
+            "elapsed_seconds": round(time.perf_counter() - start, 4),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "indexes": {
+                name: {
+                    "version": state.version,
+                    "positions": len(state.rows),
+                    "skipped_rows": state.skipped,
+                    "build_seconds": round(state.build_seconds, 4),
+                    "resident_bytes": state.resident_bytes,
+                }
+                for name, state in list(self._states.items())
+            },
+            "builds": self.builds,
+            "cone_searches": self.cone_searches,
+            "cross_matches": self.cross_matches,
+        }
+
+
+# Create global sky index instance
+sky_index = SkyIndex(dataset_registry)
+dataset_registry.add_listener(
+    sky_index.on_dataset_loaded,
+    on_unload=sky_index.on_dataset_unloaded,
+    index_bytes=sky_index.index_bytes,
+)
@@ -0,0 +1,325 @@
+"""
+Dataset Registry
+Discovers CSV datasets under DATA_DIR, loads them lazily and keeps
+loaded frames within a memory budget (least-recently-used eviction)
+
+Indexes derived from a dataset (similarity, sky positions) register
+listeners: they are built after a load, once the registry lock is released
+so other datasets stay available meanwhile, count against the memory
+budget together with their dataset and are dropped when it is evicted.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from .config import settings
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+LoadListener = Callable[[str, "pd.DataFrame", str], None]
+
+
+def index_memory(tree: Any, rows: List[Dict[str, Any]], *arrays: Any) -> int:
+    """
+    Approximate bytes held by a derived index
+    A scikit-learn neighbour tree, its per-row records (estimated from up to
+    100 of them) and any extra arrays not shared with the tree.
+    """
+    import numpy as np
+
+    tree_arrays = [np.asarray(array) for array in tree.get_arrays()]
+    total = sum(array.nbytes for array in tree_arrays)
+    total += sum(array.nbytes for array in arrays if not np.shares_memory(array, tree_arrays[0]))
+    if rows:
+        sample = rows[:100]
+        per_row = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values()) for row in sample)
+        total += sys.getsizeof(rows) + per_row * len(rows) // len(sample)
+    return total
+
+
+# Catalogs used by similarity search and evaluation when none is configured, preferred first
+CATALOG_DATASETS = ("kepler", "kepler_sample")
+
+
+class DatasetEntry:
+    """A discovered dataset file and, once loaded, its resident frame"""
+
+    def __init__(self, name: str, path: Path, kind: str):
+        self.name = name
+        self.path = path
+        self.kind = kind  # "sample", "clean" or the containing directory name
+        self.frame: Optional["pd.DataFrame"] = None
+        self.version: Optional[str] = None
+        self.resident_bytes = 0
+        self.load_seconds = 0.0
+        self.loads = 0
+        self.hits = 0
+        self.last_access: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.frame is not None
+
+    @property
+    def pipeline_name(self) -> Optional[str]:
+        """Source name in the cleaning pipeline, for data/clean/<name>_clean.csv files"""
+        if self.kind == "clean" and self.path.stem.endswith("_clean"):
+            return self.path.stem[: -len("_clean")]
+        return None
+
+    def file_version(self) -> str:
+        """Version tag derived from file size and modification time"""
+        stat = self.path.stat()
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "path": str(self.path),
+            "loaded": self.loaded,
+            "version": self.version,
+            "rows": len(self.frame) if self.loaded else None,
+            "columns": len(self.frame.columns) if self.loaded else None,
+        }
+
+
+class DatasetRegistry:
+    """Name → dataset lookup with lazy loading and LRU eviction"""
+
+    def __init__(self, data_dir: Optional[Path] = None, memory_budget_bytes: Optional[int] = None):
+        self.data_dir = Path(data_dir or settings.DATA_DIR)
+        self.memory_budget_bytes = (
+            memory_budget_bytes
+            if memory_budget_bytes is not None
+            else settings.DATASET_MEMORY_BUDGET_MB * 1024 * 1024
+        )
+        self.entries: Dict[str, DatasetEntry] = {}
+        self.evictions = 0
+        # Loaded dataset names, least recently used first
+        self._lru: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._listeners: List[LoadListener] = []
+        self._unload_listeners: List[Callable[[str], None]] = []
+        self._index_sizes: List[Callable[[str], int]] = []
+
+    # ==================== Discovery ====================
+
+    def discover(self) -> List[str]:
+        """
+        Scan DATA_DIR for CSV files
+        Raw exports and pipeline state are skipped; clean datasets are named
+        without their "_clean" suffix (data/clean/tess_clean.csv → "tess").
+        """
+        found: Dict[str, DatasetEntry] = {}
+        if self.data_dir.exists():
+            for path in sorted(self.data_dir.rglob("*.csv")):
+                relative = path.relative_to(self.data_dir)
+                if relative.parts[0] == settings.RAW_DATA_DIR.name or settings.CLEAN_STATE_DIR.name in relative.parts:
+                    continue
+                kind = relative.parts[0] if len(relative.parts) > 1 else "root"
+                name = path.stem
+                if kind == "clean" and name.endswith("_clean"):
+                    name = name[: -len("_clean")]
+                if name in found:
+                    name = f"{kind}_{name}"
+                found[name] = DatasetEntry(name, path, kind)
+
+        with self._lock:
+            for name, entry in found.items():
+                current = self.entries.get(name)
+                if current is not None and current.path == entry.path:
+                    found[name] = current
+            for name in set(self.entries) - set(found):
+                self._unload(name)
+            self.entries = found
+        return list(found)
+
+    def names(self) -> List[str]:
+        return list(self.entries)
+
+    def name_for_path(self, path: Path) -> Optional[str]:
+        """Registered name of a dataset file, if discovered"""
+        path = Path(path).resolve()
+        for entry in self.entries.values():
+            if entry.path.resolve() == path:
+                return entry.name
+        return None
+
+    def entry(self, name: str) -> DatasetEntry:
+        entry = self.entries.get(name)
+        if entry is None:
+            # New files may have been written since the last scan
+            self.discover()
+            entry = self.entries.get(name)
+        if entry is None:
+            raise KeyError(f"Unknown dataset '{name}'. Available: {', '.join(self.entries) or 'none'}")
+        return entry
+
+    def catalog(self, configured: Optional[str] = None) -> Optional[str]:
+        """Configured catalog, or the first of CATALOG_DATASETS that exists"""
+        if configured:
+            return configured
+        return next((name for name in CATALOG_DATASETS if name in self.entries), None)
+
+    def add_listener(
+        self,
+        callback: LoadListener,
+        on_unload: Optional[Callable[[str], None]] = None,
+        index_bytes: Optional[Callable[[str], int]] = None,
+    ):
+        """
+        Register callback(name, frame, version), called whenever a dataset (re)loads
+
+        Args:
+            callback: Builds derived state; runs outside the registry lock
+            on_unload: on_unload(name) frees it when the dataset is evicted or removed
+            index_bytes: index_bytes(name) is its memory, counted against the budget
+        """
+        self._listeners.append(callback)
+        if on_unload is not None:
+            self._unload_listeners.append(on_unload)
+        if index_bytes is not None:
+            self._index_sizes.append(index_bytes)
+
+    # ==================== Loading ====================
+
+    def get(self, name: str) -> "pd.DataFrame":
+        """
+        Return a dataset frame, loading it on first access
+        A dataset whose file changed on disk is reloaded.
+        """
+        with self._lock:
+            entry = self.entry(name)
+            if not entry.path.exists():
+                self._unload(name)
+                raise FileNotFoundError(f"Dataset file missing: {entry.path}")
+
+            version = entry.file_version()
+            loaded = not (entry.loaded and entry.version == version)
+            if loaded:
+                self._load(entry, version)
+            else:
+                entry.hits += 1
+
+            entry.last_access = time.time()
+            self._lru[name] = None
+            self._lru.move_to_end(name)
+            self._enforce_budget(keep=name)
+            frame = entry.frame
+
+        if loaded:
+            self._notify_loaded(entry, frame, version)
+        return frame
+
+    def version(self, name: str) -> str:
+        """Current version tag of a dataset (loads it if needed)"""
+        self.get(name)
+        return self.entries[name].version
+
+    def _load(self, entry: DatasetEntry, version: str):
+        import pandas as pd
+        from .cleaning import load_clean
+
+        start = time.perf_counter()
+        if entry.pipeline_name:
+            frame = load_clean(entry.pipeline_name, clean_dir=entry.path.parent)
+        else:
+            frame = pd.read_csv(entry.path)
+        entry.load_seconds = time.perf_counter() - start
+        entry.frame = frame
+        entry.version = version
+        entry.resident_bytes = int(frame.memory_usage(deep=True).sum())
+        entry.loads += 1
+        print(
+            f"✓ Dataset loaded: {entry.name} ({len(frame):,} rows, "
+            f"{entry.resident_bytes / 1024**2:.1f} MB, {entry.load_seconds:.2f}s)"
+        )
+
+    def _notify_loaded(self, entry: DatasetEntry, frame: "pd.DataFrame", version: str):
+        """Build derived indexes (without the lock), then re-apply the budget including them"""
+        for callback in self._listeners:
+            try:
+                callback(entry.name, frame, version)
+            except Exception as e:
+                print(f"⚠️  Warning: dataset listener failed for {entry.name}: {e}")
+
+        with self._lock:
+            if entry.frame is not frame:
+                # Evicted while the indexes were building; drop what they built
+                if not entry.loaded:
+                    self._notify_unloaded(entry.name)
+                return
+            self._enforce_budget(keep=entry.name)
+
+    def _notify_unloaded(self, name: str):
+        for callback in self._unload_listeners:
+            try:
+                callback(name)
+            except Exception as e:
+                print(f"⚠️  Warning: dataset unload listener failed for {name}: {e}")
+
+    def _unload(self, name: str):
+        entry = self.entries.get(name)
+        if entry is not None:
+            entry.frame = None
+            entry.resident_bytes = 0
+        self._lru.pop(name, None)
+        self._notify_unloaded(name)
+
+    def _enforce_budget(self, keep: str):
+        """Evict least-recently-used datasets until within budget"""
+        while self.resident_bytes() > self.memory_budget_bytes:
+            victim = next((name for name in self._lru if name != keep), None)
+            if victim is None:
+                break  # a single dataset larger than the budget stays loaded
+            self._unload(victim)
+            self.evictions += 1
+            print(f"  - Dataset evicted: {victim}")
+
+    # ==================== Reporting ====================
+
+    def index_bytes(self, name: str) -> int:
+        """Memory held by indexes derived from a dataset"""
+        return sum(size(name) for size in self._index_sizes)
+
+    def resident_bytes(self) -> int:
+        """Loaded frames plus their derived indexes"""
+        return sum(
+            entry.resident_bytes + self.index_bytes(name)
+            for name, entry in self.entries.items()
+            if entry.loaded
+        )
+
+    def describe_all(self) -> List[Dict[str, Any]]:
+        return [entry.describe() for entry in self.entries.values()]
+
+    def debug_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "resident_bytes": self.resident_bytes(),
+                "evictions": self.evictions,
+                "lru_order": list(self._lru),
+                "datasets": {
+                    name: {
+                        "loaded": entry.loaded,
+                        "version": entry.version,
+                        "resident_bytes": entry.resident_bytes,
+                        "index_bytes": self.index_bytes(name),
+                        "load_seconds": round(entry.load_seconds, 4),
+                        "loads": entry.loads,
+                        "hits": entry.hits,
+                        "last_access": entry.last_access,
+                    }
+                    for name, entry in self.entries.items()
+                },
+            }
+
+
+# Create global dataset registry instance
+dataset_registry = DatasetRegistry()
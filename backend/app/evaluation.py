@@ -0,0 +1,334 @@
+"""
+Model Evaluation
+Scores the held-out split and derives every threshold metric from one sort
+
+The test split of notebooks/02_train_lgbm_rf.ipynb is reproduced from the
+catalog (CONFIRMED vs FALSE POSITIVE rows, median imputation, the split
+recorded under metadata.json "preprocessing"). Each model scores it in one
+predict_proba call; sorting the scores once gives cumulative TP/FP counts
+at every distinct threshold, from which ROC and PR curves, confusion
+matrices and the best-F1 threshold follow without re-scoring. Results are
+cached per (model, model version, dataset, dataset version).
+
+The split is only held out when the catalog is the one trained on. On the
+bundled sample (the only catalog in the Docker images) most rows were
+training rows, so results say "held_out": false with a warning.
+"""
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .config import settings
+from .datasets import CATALOG_DATASETS, DatasetRegistry, dataset_registry
+from .models import model_manager
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+LABEL_COLUMN = "koi_disposition"
+POSITIVE_LABEL = "CONFIRMED"
+NEGATIVE_LABEL = "FALSE POSITIVE"
+
+# Split used by the training notebook when metadata.json does not record one
+DEFAULT_SPLIT = {"test_size": 0.2, "random_state": 42, "stratify": True}
+
+
+def _downsample(length: int, points: int) -> "np.ndarray":
+    """Evenly spaced indices into a curve, always keeping both ends"""
+    import numpy as np
+
+    if length <= points:
+        return np.arange(length)
+    return np.unique(np.linspace(0, length - 1, points).round().astype(np.int64))
+
+
+def threshold_metrics(labels: "np.ndarray", scores: "np.ndarray", curve_points: int = 200) -> Dict[str, Any]:
+    """
+    ROC/PR curves and confusion counts at every threshold from a single sort
+
+    A row is predicted CONFIRMED when its score is >= the threshold.
+
+    Args:
+        labels: 1 for CONFIRMED, 0 for FALSE POSITIVE
+        scores: Predicted probability of CONFIRMED
+        curve_points: Maximum points returned per curve
+
+    Returns:
+        Summary metrics, curves and a threshold table
+    """
+    import numpy as np
+
+    order = np.argsort(-scores, kind='mergesort')
+    sorted_scores = scores[order]
+    sorted_labels = labels[order]
+
+    # Last index of each run of equal scores = one operating point per distinct threshold
+    distinct = np.r_[np.nonzero(np.diff(sorted_scores))[0], len(sorted_scores) - 1]
+    tps = np.cumsum(sorted_labels)[distinct].astype(np.float64)
+    fps = (distinct + 1) - tps
+    thresholds = sorted_scores[distinct]
+    positives, negatives = tps[-1], fps[-1]
+    if positives == 0 or negatives == 0:
+        raise ValueError("Evaluation split needs both CONFIRMED and FALSE POSITIVE rows")
+
+    fns = positives - tps
+    tns = negatives - fps
+    tpr = tps / positives
+    fpr = fps / negatives
+    precision = tps / (tps + fps)
+    f1 = 2 * tps / (2 * tps + fps + fns)
+
+    # Curves start at the "predict nothing positive" point
+    roc_fpr = np.r_[0.0, fpr]
+    roc_tpr = np.r_[0.0, tpr]
+    roc_auc = float(np.sum(np.diff(roc_fpr) * (roc_tpr[1:] + roc_tpr[:-1]) / 2))
+    average_precision = float(np.sum(np.diff(np.r_[0.0, tpr]) * precision))
+
+    def at(threshold: float) -> Dict[str, Any]:
+        # Number of rows scoring >= threshold, via the sorted scores
+        predicted = int(np.searchsorted(-sorted_scores, -threshold, side='right'))
+        tp = int(sorted_labels[:predicted].sum())
+        fp = predicted - tp
+        fn = int(positives) - tp
+        tn = int(negatives) - fp
+        return {
+            "threshold": float(threshold),
+            "confusion_matrix": [[tn, fp], [fn, tp]],
+            "accuracy": (tp + tn) / len(scores),
+            "precision": tp / predicted if predicted else 0.0,
+            "recall": tp / positives,
+            "f1_score": 2 * tp / (2 * tp + fp + fn),
+            "false_positive_rate": fp / negatives,
+        }
+
+    best_f1 = int(np.argmax(f1))
+    youden = int(np.argmax(tpr - fpr))
+    keep = _downsample(len(thresholds), curve_points)
+
+    return {
+        "n_samples": int(len(scores)),
+        "positives": int(positives),
+        "negatives": int(negatives),
+        "roc_auc": roc_auc,
+        "pr_auc": average_precision,
+        "default_threshold": at(0.5),
+        "best_f1_threshold": at(float(thresholds[best_f1])),
+        "youden_threshold": at(float(thresholds[youden])),
+        "curves": {
+            "roc": {
+                "fpr": np.r_[0.0, fpr[keep]].tolist(),
+                "tpr": np.r_[0.0, tpr[keep]].tolist(),
+            },
+            "pr": {
+                "recall": tpr[keep].tolist(),
+                "precision": precision[keep].tolist(),
+            },
+            "thresholds": {
+                "threshold": thresholds[keep].tolist(),
+                "tp": tps[keep].astype(np.int64).tolist(),
+                "fp": fps[keep].astype(np.int64).tolist(),
+                "fn": fns[keep].astype(np.int64).tolist(),
+                "tn": tns[keep].astype(np.int64).tolist(),
+                "f1_score": f1[keep].tolist(),
+            },
+        },
+    }
+
+
+def calibration(labels: "np.ndarray", scores: "np.ndarray", n_bins: int = 10) -> Dict[str, Any]:
+    """Reliability bins (equal width), Brier score and expected calibration error"""
+    import numpy as np
+
+    bins = np.minimum((scores * n_bins).astype(np.int64), n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    score_sums = np.bincount(bins, weights=scores, minlength=n_bins)
+    positive_sums = np.bincount(bins, weights=labels, minlength=n_bins)
+
+    filled = counts > 0
+    mean_predicted = np.divide(score_sums, counts, out=np.zeros(n_bins), where=filled)
+    fraction_positive = np.divide(positive_sums, counts, out=np.zeros(n_bins), where=filled)
+    ece = float(np.sum(counts * np.abs(mean_predicted - fraction_positive)) / len(scores))
+
+    return {
+        "brier_score": float(np.mean((scores - labels) ** 2)),
+        "expected_calibration_error": ece,
+        "bins": [
+            {
+                "lower": i / n_bins,
+                "upper": (i + 1) / n_bins,
+                "count": int(counts[i]),
+                "mean_predicted": float(mean_predicted[i]) if filled[i] else None,
+                "fraction_confirmed": float(fraction_positive[i]) if filled[i] else None,
+            }
+            for i in range(n_bins)
+        ],
+    }
+
+
+def labeled_rows(
+    frame: "pd.DataFrame",
+    features: List[str],
+    medians: Optional["pd.Series"] = None,
+) -> Tuple["pd.DataFrame", "np.ndarray"]:
+    """
+    CONFIRMED / FALSE POSITIVE rows as the notebook prepares them
+    Numeric features with missing values filled by the column median
+    (of these rows, unless medians are given).
+    """
+    import pandas as pd
+
+    if LABEL_COLUMN not in frame.columns:
+        raise ValueError(f"Dataset has no {LABEL_COLUMN} column to evaluate against")
+
+    binary = frame[frame[LABEL_COLUMN].isin([POSITIVE_LABEL, NEGATIVE_LABEL])]
+    y = (binary[LABEL_COLUMN] == POSITIVE_LABEL).astype(int).to_numpy()
+    X = binary.reindex(columns=features).apply(pd.to_numeric, errors='coerce')
+    X = X.fillna(X.median() if medians is None else medians).fillna(0.0)
+    return X, y
+
+
+def held_out_split(
+    frame: "pd.DataFrame",
+    features: List[str],
+    metadata: Optional[Dict[str, Any]],
+) -> Tuple["pd.DataFrame", "np.ndarray", bool]:
+    """
+    Test split of the training notebook, rebuilt from a catalog frame
+
+    Returns:
+        (X_test, y_test, whether the labeled rows match the training run's count)
+    """
+    import numpy as np
+    from sklearn.model_selection import train_test_split
+
+    X, y = labeled_rows(frame, features)
+    if len(y) < 10 or y.min() == y.max():
+        raise ValueError(f"Too few labeled rows for a held-out split ({len(y)}, needs both classes)")
+    metadata = metadata or {}
+    split = {**DEFAULT_SPLIT, **metadata.get("preprocessing", {}).get("train_test_split", {})}
+    _, X_test, _, y_test = train_test_split(
+        X, y,
+        test_size=split["test_size"],
+        random_state=split["random_state"],
+        stratify=y if split["stratify"] else None,
+    )
+
+    # Same rows as the training run only if the catalog is the one trained on
+    total = metadata.get("n_samples", {}).get("total")
+    return X_test, np.asarray(y_test), total == len(X)
+
+
+class _HeldOut:
+    """Held-out features and labels for one dataset version"""
+
+    def __init__(self, dataset: str, version: str, X: "pd.DataFrame", y: "np.ndarray",
+                 reproduces_training: bool, warning: Optional[str]):
+        self.dataset = dataset
+        self.version = version
+        self.X = X
+        self.y = y
+        self.reproduces_training = reproduces_training
+        self.warning = warning
+
+    @property
+    def held_out(self) -> bool:
+        return self.warning is None
+
+
+class ModelEvaluator:
+    """Held-out evaluation per model, cached until the model or data changes"""
+
+    def __init__(self, registry: DatasetRegistry, dataset: Optional[str] = None):
+        self.registry = registry
+        self._dataset = dataset
+        self._held_out: Optional[_HeldOut] = None
+        self._cache: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.evaluations = 0
+        self.cache_hits = 0
+
+    @property
+    def dataset(self) -> Optional[str]:
+        """Configured catalog, or the first default catalog that exists"""
+        return self.registry.catalog(self._dataset)
+
+    # ==================== Held-out split ====================
+
+    def _split(self, name: str) -> _HeldOut:
+        """Rebuild the notebook's test split for the current dataset version"""
+        frame = self.registry.get(name)
+        version = self.registry.entries[name].version
+        if self._held_out is not None and self._held_out.dataset == name and self._held_out.version == version:
+            return self._held_out
+
+        X_test, y_test, reproduces = held_out_split(frame, model_manager.features, model_manager.metadata)
+        warning = None
+        if self.registry.entries[name].kind == "sample":
+            warning = (
+                f"'{name}' is the bundled sample, whose rows were mostly used in training; "
+                f"metrics are optimistic. Clean the full catalog (data/clean/kepler_clean.csv) for a held-out evaluation."
+            )
+        elif not reproduces:
+            warning = (
+                f"'{name}' differs from the catalog trained on, so this split is not the training run's "
+                f"test split and may contain training rows."
+            )
+        if warning:
+            print(f"⚠️  Warning: evaluation is not held out: {warning}")
+        self._held_out = _HeldOut(name, version, X_test, y_test, reproduces, warning)
+        return self._held_out
+
+    # ==================== Evaluation ====================
+
+    def evaluate(self, model_type: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Held-out metrics for one model (cached)
+
+        Args:
+            model_type: "lgbm" or "rf"
+            refresh: Recompute even if a cached result is current
+        """
+        model = model_manager.get_model(model_type)
+        name = self.dataset
+        if name is None:
+            raise ValueError(f"No catalog dataset to evaluate on (looked for {', '.join(CATALOG_DATASETS)})")
+
+        with self._lock:
+            held_out = self._split(name)
+            key = (model_type, model_manager.versions.get(model_type, ""), name, held_out.version)
+            cached = self._cache.get(key)
+            if cached is not None and not refresh:
+                self.cache_hits += 1
+                return cached
+
+            start = time.perf_counter()
+            scores = model.predict_proba(held_out.X)[:, 1]
+            result = {
+                "model_used": model_type,
+                "model_version": key[1],
+                "dataset": name,
+                "dataset_version": held_out.version,
+                "held_out": held_out.held_out,
+                "warning": held_out.warning,
+                "split": {
+                    "rows": int(len(held_out.y)),
+                    "reproduces_training_split": held_out.reproduces_training,
+                },
+                "metrics": threshold_metrics(held_out.y, scores, settings.EVALUATION_CURVE_POINTS),
+                "calibration": calibration(held_out.y, scores, settings.EVALUATION_CALIBRATION_BINS),
+                "evaluated_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "elapsed_seconds": round(time.perf_counter() - start, 4),
+            }
+
+            # Keep only the current result per model
+            for stale in [k for k in self._cache if k[0] == model_type]:
+                del self._cache[stale]
+            self._cache[key] = result
+            self.evaluations += 1
+            return result
+
+
+# Create global model evaluator instance
+model_evaluator = ModelEvaluator(dataset_registry, settings.EVALUATION_DATASET)
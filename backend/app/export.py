@@ -0,0 +1,291 @@
+"""
+Dataset Export
+Streams a whole dataset (or a filtered, projected subset) in bounded chunks
+
+Rows are read from the dataset file with pandas' chunked CSV reader and
+encoded chunk by chunk as CSV, NDJSON or Parquet row groups, optionally
+gzip-compressed on the fly. Memory use is bounded by EXPORT_CHUNK_SIZE rows
+regardless of dataset size (plus the key column for pipeline-built clean
+files, whose superseded rows are skipped).
+"""
+import io
+import re
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import settings
+from .datasets import DatasetEntry
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+COMPRESSIONS = ("none", "gzip")
+
+_FILTER_PATTERN = re.compile(r"^\s*([A-Za-z0-9_]+)\s*(==|!=|<=|>=|<|>)\s*(.+?)\s*$")
+
+
+class ExportError(ValueError):
+    """Invalid export request (unknown column, format or filter)"""
+
+
+# ==================== Request parsing ====================
+
+def parse_filters(filters: List[str], columns: List[str]) -> List[Tuple[str, str, Any]]:
+    """
+    Parse filter expressions like "koi_period<10" or "koi_disposition==CONFIRMED"
+
+    Values that parse as numbers are compared numerically, others as strings.
+    """
+    parsed = []
+    for expression in filters:
+        match = _FILTER_PATTERN.match(expression)
+        if not match:
+            raise ExportError(f"Invalid filter '{expression}'. Use <column><op><value> with ==, !=, <, <=, > or >=")
+        column, op, value = match.groups()
+        if column not in columns:
+            raise ExportError(f"Unknown filter column '{column}'")
+        try:
+            value = float(value)
+        except ValueError:
+            value = value.strip("'\"")
+        parsed.append((column, op, value))
+    return parsed
+
+
+def _mask(chunk: "pd.DataFrame", filters: List[Tuple[str, str, Any]]) -> "np.ndarray":
+    import numpy as np
+    import pandas as pd
+
+    mask = np.ones(len(chunk), dtype=bool)
+    for column, op, value in filters:
+        series = chunk[column]
+        if isinstance(value, float):
+            series = pd.to_numeric(series, errors='coerce')
+        else:
+            series = series.astype("string")
+        if op == "==":
+            result = series == value
+        elif op == "!=":
+            result = series != value
+        elif op == "<":
+            result = series < value
+        elif op == "<=":
+            result = series <= value
+        elif op == ">":
+            result = series > value
+        else:
+            result = series >= value
+        mask &= result.fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+# ==================== Chunk sources ====================
+
+def read_header(entry: DatasetEntry) -> List[str]:
+    import pandas as pd
+
+    return list(pd.read_csv(entry.path, nrows=0).columns)
+
+
+def _superseded_rows(entry: DatasetEntry, chunk_size: int) -> Optional["np.ndarray"]:
+    """
+    Boolean mask of rows replaced by a later append (pipeline-built files only)
+    Reads just the key column, one chunk at a time.
+    """
+    import numpy as np
+    import pandas as pd
+    from .cleaning import dedupe_key
+
+    if not entry.pipeline_name:
+        return None
+    key = dedupe_key(entry.pipeline_name, clean_dir=entry.path.parent)
+    if not key:
+        return None
+
+    keys = pd.concat(
+        chunk[key] for chunk in pd.read_csv(entry.path, usecols=[key], dtype=str, chunksize=chunk_size)
+    ) if entry.path.stat().st_size else pd.Series(dtype=str)
+    superseded = keys.duplicated(keep='last').to_numpy()
+    return superseded if superseded.any() else None
+
+
+def iter_chunks(
+    entry: DatasetEntry,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[Tuple[str, str, Any]]] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator["pd.DataFrame"]:
+    """Yield projected, filtered chunks of a dataset file"""
+    import pandas as pd
+
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    filters = filters or []
+    header = read_header(entry)
+    wanted = columns or header
+    # Filter columns must be read even if they are not exported
+    usecols = [col for col in header if col in set(wanted) | {f[0] for f in filters}]
+
+    superseded = _superseded_rows(entry, chunk_size)
+    offset = 0
+    for chunk in pd.read_csv(entry.path, usecols=usecols, chunksize=chunk_size):
+        rows = len(chunk)
+        keep = None
+        if superseded is not None:
+            keep = ~superseded[offset:offset + rows]
+        offset += rows
+        if filters:
+            mask = _mask(chunk, filters)
+            keep = mask if keep is None else keep & mask
+        if keep is not None:
+            chunk = chunk[keep]
+        if len(chunk):
+            yield chunk[wanted]
+
+
+# ==================== Encoders ====================
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose buffered bytes can be taken after each write"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _encode_text(chunks: Iterator["pd.DataFrame"], fmt: str) -> Iterator[bytes]:
+    first = True
+    for chunk in chunks:
+        if fmt == "csv":
+            yield chunk.to_csv(index=False, header=first).encode()
+        else:
+            text = chunk.to_json(orient='records', lines=True)
+            # Recent pandas already ends the last record with a newline; older versions do not
+            if text and not text.endswith("\n"):
+                text += "\n"
+            yield text.encode()
+        first = False
+
+
+def _encode_parquet(chunks: Iterator["pd.DataFrame"], compression: str) -> Iterator[bytes]:
+    """One Parquet row group per chunk; schema fixed by the first chunk"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _Drain()
+    writer = None
+    schema = None
+    for chunk in chunks:
+        if schema is None:
+            fields = []
+            for name, dtype in chunk.dtypes.items():
+                if pd.api.types.is_bool_dtype(dtype):
+                    fields.append(pa.field(name, pa.bool_()))
+                elif pd.api.types.is_numeric_dtype(dtype):
+                    fields.append(pa.field(name, pa.float64()))
+                else:
+                    fields.append(pa.field(name, pa.string()))
+            schema = pa.schema(fields)
+            writer = pq.ParquetWriter(sink, schema, compression=compression)
+        # Later chunks may infer different dtypes (e.g. an all-empty column)
+        for field in schema:
+            if pa.types.is_floating(field.type):
+                chunk[field.name] = pd.to_numeric(chunk[field.name], errors='coerce').astype("float64")
+            elif pa.types.is_string(field.type):
+                column = chunk[field.name]
+                chunk[field.name] = column.astype("string").where(column.notna(), None)
+        writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        yield sink.take()
+    if writer is not None:
+        writer.close()
+        yield sink.take()
+
+
+def _gzip(stream: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 → gzip container
+    for data in stream:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(
+    entry: DatasetEntry,
+    fmt: str,
+    compression: str = "none",
+    columns: Optional[List[str]] = None,
+    filters: Optional[List[str]] = None,
+) -> Tuple[Iterator[bytes], Dict[str, str]]:
+    """
+    Build a byte stream and response headers for an export
+
+    Args:
+        entry: Dataset to export
+        fmt: csv, ndjson or parquet
+        compression: none or gzip (for parquet, the internal column codec)
+        columns: Columns to include (default: all)
+        filters: Filter expressions, see parse_filters()
+
+    Returns:
+        (byte iterator, headers dict including media type and filename)
+    """
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format '{fmt}'. Use one of: {', '.join(FORMATS)}")
+    if compression not in COMPRESSIONS:
+        raise ExportError(f"Unknown compression '{compression}'. Use one of: {', '.join(COMPRESSIONS)}")
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ExportError("Parquet export requires pyarrow on the server")
+
+    header = read_header(entry)
+    if columns:
+        unknown = [col for col in columns if col not in header]
+        if unknown:
+            raise ExportError(f"Unknown column(s): {', '.join(unknown)}")
+    parsed_filters = parse_filters(filters or [], header)
+
+    chunks = iter_chunks(entry, columns=columns, filters=parsed_filters)
+    media_type, extension = FORMATS[fmt]
+    filename = f"{entry.name}.{extension}"
+
+    if fmt == "parquet":
+        stream = _encode_parquet(chunks, "gzip" if compression == "gzip" else "snappy")
+    else:
+        stream = _encode_text(chunks, fmt)
+        if compression == "gzip":
+            stream = _gzip(stream)
+            media_type = "application/gzip"
+            filename += ".gz"
+
+    return stream, {
+        "media_type": media_type,
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
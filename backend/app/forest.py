@@ -0,0 +1,73 @@
+"""
+Early-Exit Forest Inference
+Evaluates RandomForest trees in batches and stops once the vote is settled
+
+The forest's probability is the mean of its trees' probabilities. After k of
+T trees, the running mean is a sample (without replacement) of the final
+one, so by Serfling's inequality the chance that the remaining trees pull
+it across 0.5 is at most exp(-2 k d^2 / (1 - (k - 1) / T)), where d is the
+running mean's distance from 0.5. A row stops once that bound is below the
+tolerance; confident rows (most obvious false positives) finish after the
+first batch. Trees are called through their low-level tree_.predict, which
+avoids sklearn's per-call validation and thread dispatch.
+"""
+from typing import TYPE_CHECKING, Any, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _tree_positive_proba(tree: Any, x: "np.ndarray", positive: int) -> "np.ndarray":
+    values = tree.tree_.predict(x)
+    if values.ndim == 3:  # (rows, outputs, classes) in older scikit-learn
+        values = values[:, 0, :]
+    # Leaf values are class fractions (or counts in older versions)
+    return values[:, positive] / values.sum(axis=1)
+
+
+def early_exit_proba(
+    forest: Any,
+    X: Any,
+    batch_size: int = 25,
+    tolerance: float = 0.001,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Probability of class 1 per row, using only as many trees as needed
+
+    Args:
+        forest: Fitted RandomForestClassifier with classes [0, 1]
+        X: Feature matrix in training column order
+        batch_size: Trees evaluated between stopping checks
+        tolerance: Upper bound on the chance the final class differs (0 = all trees)
+
+    Returns:
+        (P(class 1), trees used) per row
+    """
+    import numpy as np
+
+    x = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+    trees = forest.estimators_
+    total = len(trees)
+    positive = list(forest.classes_).index(1)
+
+    sums = np.zeros(len(x))
+    used = np.zeros(len(x), dtype=np.int64)
+    active = np.arange(len(x))
+
+    for start in range(0, total, batch_size):
+        rows = x[active]
+        batch = trees[start:start + batch_size]
+        sums[active] += np.sum([_tree_positive_proba(tree, rows, positive) for tree in batch], axis=0)
+        used[active] = start + len(batch)
+
+        k = used[active]
+        distance = sums[active] / k - 0.5
+        remaining_fraction = np.maximum(1 - (k - 1) / total, 1e-12)
+        bound = np.exp(-2 * k * distance ** 2 / remaining_fraction)
+        # tolerance 0 means every tree, even where the bound underflows to 0 near the end
+        settled = (k >= total) | ((tolerance > 0) & (bound <= tolerance))
+        active = active[~settled]
+        if active.size == 0:
+            break
+
+    return sums / used, used
@@ -2,23 +2,79 @@
 FastAPI Main Application
 Exoplanet Classification API
 """
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
-import pandas as pd
 import json
 import os
-from typing import Optional
+import time
+from typing import List, Optional
 
 from .config import settings
+from .startup import startup_report
 from .schemas import (
     HealthResponse,
     DatasetResponse,
     StatsResponse,
     PredictionInput,
-    PredictionOutput
+    PredictionOutput,
+    ModelType,
+    DatasetListResponse,
+    SimilarityRequest,
+    SimilarityResponse,
+    ConeSearchResponse,
+    CrossMatchResponse,
+    SweepRequest,
+    SweepResponse
 )
 from .models import model_manager
+from .datasets import dataset_registry
+from .similarity import similarity_index
+from .admission import AdmissionControlMiddleware, admission_controller
+from .monitoring import feature_monitor
+from .model_selection import budget_from_request, model_selector, waited_ms
+from .batch import (
+    FORMAT_MEDIA_TYPES,
+    BatchFormatError,
+    BatchValidationError,
+    decode_batch,
+    encode_result,
+    format_for_accept,
+    validate_columns
+)
+from .export import ExportError, export_stream
+from .sweep import run_sweep
+from .evaluation import model_evaluator
+from .shadow import shadow_evaluator
+from .prediction_log import prediction_log
+from .crossmatch import sky_index
+
+startup_report.record("import", startup_report.since_import())
+
+
+def warm_up_datasets():
+    """Load the similarity catalog and build its index so the first query is fast"""
+    try:
+        with startup_report.phase("dataset_load"):
+            similarity_index.ensure()
+    except Exception as e:
+        print(f"⚠️  Warning: Similarity index not built: {e}")
+    startup_report.mark_ready()
+    print(f"✓ Startup: {startup_report.format()}")
+
+
+async def require_models():
+    """Wait for an in-progress model load, or fail with 503"""
+    if model_manager.models_loaded:
+        return
+    loaded = await run_in_threadpool(model_manager.wait_until_loaded, settings.MODEL_LOAD_WAIT_SECONDS)
+    if not loaded:
+        raise HTTPException(
+            status_code=503,
+            detail="Models not loaded. Server may still be starting up."
+        )
 
 
 @asynccontextmanager
@@ -32,20 +88,34 @@ async def lifespan(app: FastAPI):
     print(f"PORT: {os.getenv('PORT', '8000')}")
     
     # Verify paths exist
-    import os as os_check
-    print(f"Models dir exists: {os_check.path.exists(settings.MODELS_DIR)}")
-    print(f"Sample data exists: {os_check.path.exists(settings.SAMPLE_DATASET_PATH)}")
+    print(f"Models dir exists: {settings.MODELS_DIR.exists()}")
+    print(f"Sample data exists: {settings.SAMPLE_DATASET_PATH.exists()}")
+    
+    # Discover datasets (loaded lazily on first request)
+    if not dataset_registry.entries:
+        dataset_registry.discover()
+    print(f"✓ Datasets discovered: {', '.join(dataset_registry.names()) or 'none'}")
     
-    # Load ML models
-    success = model_manager.load_models()
-    if not success:
-        print("⚠️  Warning: Models failed to load. Prediction endpoint will not work.")
+    # Load ML models (already loaded when preforked by backend.app.serve)
+    if model_manager.models_loaded:
+        print("✓ Models preloaded by parent process")
+        warm_up_datasets()
+    elif settings.MODEL_LOAD_IN_BACKGROUND:
+        # Start serving right away; the ML stack loads in a background thread
+        print("⏳ Loading models in background")
+        model_manager.start_background_load(after=warm_up_datasets)
     else:
-        print("✓ Models loaded successfully")
+        success = model_manager.load_models()
+        if not success:
+            print("⚠️  Warning: Models failed to load. Prediction endpoint will not work.")
+        else:
+            print("✓ Models loaded successfully")
+        warm_up_datasets()
     
     yield
     
     # Shutdown
+    prediction_log.close()
     print("\n👋 Shutting down API")
 
 
@@ -60,6 +130,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Shed load on heavy routes before it reaches the handlers
+# (added first so CORS headers still wrap 503 responses)
+app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -98,6 +172,7 @@ async def health_check():
 
 @app.get(f"{settings.API_V1_PREFIX}/dataset", response_model=DatasetResponse, tags=["Data"])
 async def get_dataset(
+    name: Optional[str] = Query(None, description="Dataset name from /datasets (overrides sample)"),
     sample: bool = Query(True, description="Use sample dataset (500 rows) vs full dataset"),
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(50, ge=1, le=settings.MAX_PAGE_SIZE, description="Items per page")
@@ -105,26 +180,25 @@ async def get_dataset(
     """
     Get paginated dataset
     
+    - **name**: Registered dataset name (see `/datasets`), e.g. `kepler_sample` or `tess`
     - **sample**: If true, uses small sample dataset (500 rows), otherwise uses full cleaned dataset
     - **page**: Page number (starts at 1)
     - **page_size**: Number of records per page (max 500)
     """
     try:
         # Choose dataset
-        if sample:
-            dataset_path = settings.SAMPLE_DATASET_PATH
-        else:
-            dataset_path = settings.CLEAN_DATASET_PATH
-        
-        # Check if file exists
-        if not dataset_path.exists():
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Dataset not found: {dataset_path}. Please run data preparation notebooks first."
-            )
+        if name is None:
+            dataset_path = settings.SAMPLE_DATASET_PATH if sample else settings.CLEAN_DATASET_PATH
+            name = dataset_registry.name_for_path(dataset_path)
+            if name is None:
+                raise HTTPException(
+                    status_code=404, 
+                    detail=f"Dataset not found: {dataset_path}. Please run data preparation notebooks first. "
+                           f"Available datasets: {', '.join(dataset_registry.names()) or 'none'}"
+                )
         
-        # Load dataset
-        df = pd.read_csv(dataset_path)
+        # Load dataset (cached by the registry)
+        df = await run_in_threadpool(dataset_registry.get, name)
         total_records = len(df)
         total_pages = (total_records + page_size - 1) // page_size
         
@@ -155,10 +229,215 @@ async def get_dataset(
         
     except HTTPException:
         raise
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e).strip("'\""))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading dataset: {str(e)}")
 
 
+@app.get(f"{settings.API_V1_PREFIX}/datasets", response_model=DatasetListResponse, tags=["Data"])
+async def list_datasets():
+    """
+    List datasets available to `/dataset?name=`
+    Rescans the data directory, so newly cleaned files show up without a restart
+    """
+    await run_in_threadpool(dataset_registry.discover)
+    return DatasetListResponse(datasets=dataset_registry.describe_all())
+
+
+@app.get(f"{settings.API_V1_PREFIX}/dataset/export", tags=["Data"])
+async def export_dataset(
+    name: str = Query(..., description="Dataset name from /datasets"),
+    format: str = Query("csv", description="csv, ndjson or parquet"),
+    compression: str = Query("none", description="none or gzip"),
+    columns: Optional[List[str]] = Query(None, description="Columns to include (repeat or comma-separate)"),
+    filter: Optional[List[str]] = Query(None, description="Row filters like koi_period<10 (repeatable, ANDed)")
+):
+    """
+    Stream a whole dataset as a file download
+    
+    Rows are read and encoded in chunks, so memory stays flat however large
+    the dataset is. The dataset does not need to be loaded in the registry.
+    
+    - **format**: `csv`, `ndjson` (one JSON object per line) or `parquet` (needs pyarrow)
+    - **compression**: `gzip` compresses csv/ndjson output; for parquet it selects the column codec
+    - **columns**: e.g. `columns=kepoi_name,koi_period`
+    - **filter**: `<column><op><value>` with `==`, `!=`, `<`, `<=`, `>`, `>=`, e.g. `filter=koi_disposition==CONFIRMED`
+    """
+    if columns:
+        columns = [col.strip() for value in columns for col in value.split(",") if col.strip()]
+    try:
+        entry = dataset_registry.entry(name)
+        stream, headers = await run_in_threadpool(
+            export_stream, entry, format.lower(), compression.lower(), columns, filter
+        )
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e).strip("'\""))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting dataset: {str(e)}")
+    
+    media_type = headers.pop("media_type")
+    return StreamingResponse(stream, media_type=media_type, headers=headers)
+
+
+@app.get(f"{settings.API_V1_PREFIX}/crossmatch/cone", response_model=ConeSearchResponse, tags=["Data"])
+async def cone_search(
+    dataset: str = Query(..., description="Dataset with ra/dec columns, e.g. tess"),
+    ra: float = Query(..., description="Right ascension in degrees"),
+    dec: float = Query(..., ge=-90, le=90, description="Declination in degrees"),
+    radius_arcsec: float = Query(10.0, gt=0, description="Cone radius in arcseconds"),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum matches returned")
+):
+    """
+    Rows of a dataset within an angular radius of a sky position, nearest first
+    
+    Positions are indexed as unit vectors in a KD-tree when the dataset loads,
+    so a cone search is a single tree query.
+    """
+    try:
+        result = await run_in_threadpool(sky_index.cone_search, dataset, ra, dec, radius_arcsec, limit)
+        return ConeSearchResponse(**result)
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e).strip("'\""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Cone search error: {str(e)}")
+
+
+@app.get(f"{settings.API_V1_PREFIX}/crossmatch", response_model=CrossMatchResponse, tags=["Data"])
+async def cross_match(
+    source: str = Query(..., description="Dataset whose positions are looked up, e.g. kepler_sample"),
+    target: str = Query(..., description="Dataset searched around each source position, e.g. tess"),
+    radius_arcsec: float = Query(5.0, gt=0, description="Match radius in arcseconds"),
+    nearest_only: bool = Query(True, description="Keep only the closest target per source row"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum pairs returned (default: all)")
+):
+    """
+    Cross-match two catalogs by sky position
+    
+    Every source position is queried against the target's unit-vector KD-tree
+    in one batched call, e.g. which TESS objects of interest coincide with
+    Kepler KOIs: `?source=kepler&target=tess&radius_arcsec=5`.
+    """
+    try:
+        result = await run_in_threadpool(sky_index.cross_match, source, target, radius_arcsec, nearest_only, limit)
+        return CrossMatchResponse(**result)
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e).strip("'\""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Cross-match error: {str(e)}")
+
+
+@app.get(f"{settings.API_V1_PREFIX}/debug/datasets", tags=["Debug"])
+async def debug_datasets():
+    """Per-dataset resident memory, load time and cache hits"""
+    return dataset_registry.debug_stats()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/debug/crossmatch", tags=["Debug"])
+async def debug_crossmatch():
+    """Sky index sizes, build times and query counts per dataset"""
+    return sky_index.stats()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/debug/admission", tags=["Debug"])
+async def debug_admission():
+    """In-flight, queued and rejected request counts per route group (this worker process)"""
+    return admission_controller.stats()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/debug/model-selection", tags=["Debug"])
+async def debug_model_selection():
+    """Accuracy ranking, recent per-model latency and auto-mode choices"""
+    return model_selector.stats()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/debug/prediction-log", tags=["Debug"])
+async def debug_prediction_log():
+    """Prediction log buffer, writer and file statistics"""
+    return prediction_log.stats()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/debug/startup", tags=["Debug"])
+async def debug_startup():
+    """Cold-start breakdown: interpreter, imports, model load and dataset load times"""
+    return startup_report.summary()
+
+
+@app.get(f"{settings.API_V1_PREFIX}/monitoring/features", tags=["Stats"])
+async def get_feature_monitoring():
+    """
+    Distribution of feature values sent to /predict, next to the training reference
+    
+    Per model feature: how often it was provided or defaulted, live quantiles
+    (p01-p99, within 1% relative error) and the reference quantiles, plus the
+    shift of the live median in units of the reference interquartile range.
+    
+    Counts cover the worker process that answers (`worker_pid`), not the
+    whole server, when running preforked workers.
+    """
+    try:
+        await require_models()
+        return await run_in_threadpool(
+            feature_monitor.report,
+            model_manager.features,
+            model_manager.get_metadata()
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building monitoring report: {str(e)}")
+
+
+@app.get(f"{settings.API_V1_PREFIX}/evaluation", tags=["Stats"])
+async def get_evaluation(
+    model_type: ModelType = Query(ModelType.LIGHTGBM, description="Model to evaluate"),
+    refresh: bool = Query(False, description="Recompute even if a cached result is current")
+):
+    """
+    Held-out evaluation computed from the served model
+    
+    Reproduces the training notebook's test split from the catalog, scores it
+    once and returns ROC/PR curves, confusion counts across thresholds,
+    calibration bins and summary metrics. Results are cached until the model
+    file or the dataset changes.
+    
+    `held_out` is false (with a `warning`) when the catalog is not the one
+    trained on, e.g. the bundled `kepler_sample`, whose rows were mostly used
+    in training: those metrics are optimistic.
+    """
+    try:
+        await require_models()
+        return await run_in_threadpool(model_evaluator.evaluate, model_type.value, refresh)
+    except HTTPException:
+        raise
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e).strip("'\""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Evaluation error: {str(e)}")
+
+
+@app.get(f"{settings.API_V1_PREFIX}/monitoring/shadow", tags=["Stats"])
+async def get_shadow_stats():
+    """
+    Candidate model vs served model on sampled live traffic
+    
+    Disagreement rate, mean probability difference, latency quantiles for both
+    models and counts of samples dropped under load. Configure with
+    `SHADOW_MODEL_PATH` and `SHADOW_SAMPLE_RATE`. Covers the answering worker
+    process only (`worker_pid`).
+    """
+    return shadow_evaluator.stats()
+
+
 @app.get(f"{settings.API_V1_PREFIX}/stats", response_model=StatsResponse, tags=["Stats"])
 async def get_stats():
     """
@@ -166,11 +445,7 @@ async def get_stats():
     Returns information about trained models, metrics, and features
     """
     try:
-        if not model_manager.models_loaded:
-            raise HTTPException(
-                status_code=503,
-                detail="Models not loaded. Please check server logs."
-            )
+        await require_models()
         
         metadata = model_manager.get_metadata()
         
@@ -190,7 +465,7 @@ async def get_stats():
 
 
 @app.post(f"{settings.API_V1_PREFIX}/predict", response_model=PredictionOutput, tags=["Prediction"])
-async def predict(input_data: PredictionInput):
+async def predict(input_data: PredictionInput, request: Request, background_tasks: BackgroundTasks):
     """
     Predict exoplanet classification
     
@@ -199,6 +474,10 @@ async def predict(input_data: PredictionInput):
     - Probability scores for each class
     - Top contributing features
     
+    With `"model_type": "auto"` the server picks the most accurate model whose
+    recent latency fits `latency_budget_ms` (or the `X-Latency-Budget-Ms`
+    header); `model_used` and `selection` say which one and why.
+    
     Example request body:
     ```json
     {
@@ -214,24 +493,40 @@ async def predict(input_data: PredictionInput):
     ```
     """
     try:
-        if not model_manager.models_loaded:
-            raise HTTPException(
-                status_code=503,
-                detail="Models not loaded. Server may still be starting up."
-            )
+        await require_models()
         
         # Convert Pydantic model to dict
-        input_dict = input_data.model_dump(exclude={'model_type'})
+        input_dict = input_data.model_dump(exclude={'model_type', 'similar_k', 'latency_budget_ms'})
         
         # Remove None values
         input_dict = {k: v for k, v in input_dict.items() if v is not None}
         
-        # Make prediction
-        result = model_manager.predict(
+        model_type, selection = input_data.model_type.value, None
+        if input_data.model_type == ModelType.AUTO:
+            budget = budget_from_request(request.headers, input_data.latency_budget_ms)
+            model_type, selection = model_selector.choose(budget, waited_ms=waited_ms(request))
+        
+        # Make prediction (off the event loop so priority routes stay responsive)
+        start = time.perf_counter()
+        result = await run_in_threadpool(
+            model_manager.predict,
             input_data=input_dict,
-            model_type=input_data.model_type.value
+            model_type=model_type
         )
         
+        elapsed = time.perf_counter() - start
+        model_selector.record(model_type, elapsed)
+        result["selection"] = selection
+        
+        # Audit record, written later by a background thread
+        prediction_log.record(input_dict, result, model_manager.versions.get(result["model_used"]), elapsed)
+        # Sampled shadow copy, handed off after the response is sent
+        background_tasks.add_task(shadow_evaluator.submit, input_dict, result, elapsed)
+        
+        if input_data.similar_k:
+            neighbours = await run_in_threadpool(similarity_index.query, [input_dict], k=input_data.similar_k)
+            result["similar"] = neighbours[0]
+        
         return PredictionOutput(**result)
         
     except HTTPException:
@@ -242,6 +537,147 @@ async def predict(input_data: PredictionInput):
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 
+def score_batch(body: bytes, request: Request, model_type: Optional[ModelType],
+                budget: Optional[float], response_format: str):
+    """Decode, validate, score and encode one batch (runs in the thread pool)"""
+    columns, body_model_type = decode_batch(body, request.headers.get("content-type"))
+    chosen_model = (model_type or ModelType(body_model_type or settings.DEFAULT_MODEL)).value
+    features = validate_columns(columns, model_manager.features, settings.BATCH_MAX_ROWS)
+    if chosen_model == ModelType.AUTO.value:
+        chosen_model, _ = model_selector.choose(budget, rows=len(features), waited_ms=waited_ms(request))
+    
+    start = time.perf_counter()
+    result = model_manager.predict_batch(features, model_type=chosen_model)
+    elapsed = time.perf_counter() - start
+    model_selector.record(chosen_model, elapsed, rows=len(features))
+    prediction_log.record_batch(features, result, model_manager.versions.get(chosen_model), elapsed)
+    return encode_result(result, response_format), chosen_model
+
+
+@app.post(f"{settings.API_V1_PREFIX}/predict/batch", tags=["Prediction"])
+async def predict_batch(
+    request: Request,
+    model_type: Optional[ModelType] = Query(None, description="Model to use (overrides model_type in the body)"),
+    format: Optional[str] = Query(None, description="Response format: json, arrow or msgpack (default: from Accept)")
+):
+    """
+    Score a batch of candidates sent column-wise
+    
+    The body is selected by `Content-Type`:
+    - `application/json`: `{"model_type": "lgbm", "columns": {"koi_period": [...], "koi_depth": [...]}}`
+    - `application/vnd.apache.arrow.stream`: Arrow IPC stream, one column per feature
+    - `application/msgpack`: the same map as the JSON body
+    
+    Columns are validated once each against the `PredictionInput` constraints and
+    scored in a single model call. The response carries `predicted_class`,
+    `probability_false_positive`, `probability_confirmed` and `confidence` columns.
+    
+    `model_type=auto` picks a model within the `X-Latency-Budget-Ms` header's
+    budget for this many rows; the choice is in `model_used` and `X-Model-Used`.
+    """
+    try:
+        await require_models()
+        
+        response_format = format or format_for_accept(request.headers.get("accept"))
+        if response_format not in FORMAT_MEDIA_TYPES:
+            raise BatchFormatError(f"Unknown response format: {response_format}")
+        
+        budget = budget_from_request(request.headers, None)
+        body = await request.body()
+        # Decoding, validation and encoding scale with the batch, so they run off the event loop too
+        content, chosen_model = await run_in_threadpool(
+            score_batch, body, request, model_type, budget, response_format
+        )
+        return Response(
+            content=content,
+            media_type=FORMAT_MEDIA_TYPES[response_format],
+            headers={"X-Model-Used": chosen_model}
+        )
+        
+    except HTTPException:
+        raise
+    except BatchValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    except BatchFormatError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+
+@app.post(f"{settings.API_V1_PREFIX}/predict/sweep", response_model=SweepResponse, tags=["Prediction"])
+async def predict_sweep(request: SweepRequest):
+    """
+    What-if sweep: vary one or two features of a base candidate
+    
+    The whole grid is built as one feature matrix and scored in a single
+    batched inference, so a 100-point curve costs about as much as one
+    `/predict` call. One axis returns a probability curve, two axes a
+    surface (`probability_confirmed[i][j]` for axis-0 value i and axis-1 value j).
+    
+    Example request body:
+    ```json
+    {
+        "base": {"koi_period": 12.34, "koi_duration": 3.1, "koi_prad": 1.2, "koi_depth": 1200.0},
+        "axes": [
+            {"feature": "koi_period", "start": 0.5, "stop": 500, "num": 100, "log": true},
+            {"feature": "koi_prad", "values": [0.5, 1, 2, 4, 8, 16]}
+        ]
+    }
+    ```
+    """
+    try:
+        await require_models()
+        
+        base = request.base.model_dump(exclude={'model_type', 'similar_k', 'latency_budget_ms'})
+        base = {k: v for k, v in base.items() if v is not None}
+        
+        budget = request.base.latency_budget_ms
+        result = await run_in_threadpool(run_sweep, base, request.axes, request.base.model_type.value, budget)
+        return SweepResponse(**result)
+        
+    except HTTPException:
+        raise
+    except BatchValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Sweep error: {str(e)}")
+
+
+@app.post(f"{settings.API_V1_PREFIX}/similar", response_model=SimilarityResponse, tags=["Prediction"])
+async def find_similar(request: SimilarityRequest):
+    """
+    Find the most similar known KOIs for one or more candidates
+    
+    Candidates are matched on standardized model features against a ball-tree
+    index of the catalog dataset; all inputs are answered in one batched query.
+    """
+    try:
+        inputs = [
+            {k: v for k, v in item.model_dump(exclude={'model_type', 'similar_k', 'latency_budget_ms'}).items() if v is not None}
+            for item in request.inputs
+        ]
+        results = await run_in_threadpool(similarity_index.query, inputs, k=request.k)
+        stats = similarity_index.stats()
+        
+        return SimilarityResponse(
+            dataset=stats["dataset"],
+            version=stats["version"],
+            k=len(results[0]) if results else request.k,
+            results=results
+        )
+        
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e).strip("'\""))
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Similarity search error: {str(e)}")
+
+
 # ==================== Additional Info ====================
 
 @app.get(f"{settings.API_V1_PREFIX}/info", tags=["Info"])
@@ -254,8 +690,18 @@ async def get_api_info():
         "endpoints": {
             "health": f"{settings.API_V1_PREFIX}/health",
             "dataset": f"{settings.API_V1_PREFIX}/dataset",
+            "datasets": f"{settings.API_V1_PREFIX}/datasets",
+            "dataset_export": f"{settings.API_V1_PREFIX}/dataset/export",
+            "crossmatch": f"{settings.API_V1_PREFIX}/crossmatch",
+            "cone_search": f"{settings.API_V1_PREFIX}/crossmatch/cone",
             "stats": f"{settings.API_V1_PREFIX}/stats",
+            "evaluation": f"{settings.API_V1_PREFIX}/evaluation",
+            "monitoring": f"{settings.API_V1_PREFIX}/monitoring/features",
+            "shadow": f"{settings.API_V1_PREFIX}/monitoring/shadow",
             "predict": f"{settings.API_V1_PREFIX}/predict",
+            "predict_batch": f"{settings.API_V1_PREFIX}/predict/batch",
+            "predict_sweep": f"{settings.API_V1_PREFIX}/predict/sweep",
+            "similar": f"{settings.API_V1_PREFIX}/similar",
             "docs": f"{settings.API_V1_PREFIX}/docs"
         },
         "models": {
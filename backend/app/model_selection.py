@@ -0,0 +1,237 @@
+"""
+Automatic Model Selection
+Picks the most accurate model that fits a request's latency budget
+
+Requests with model_type "auto" carry a budget (latency_budget_ms in the
+body or an X-Latency-Budget-Ms header). Models are ranked by held-out
+accuracy from metadata.json; each one's expected latency is the recent p90
+of its per-row service time for requests of a similar size (power-of-two
+row buckets; samples older than AUTO_STATS_WINDOW_SECONDS are discarded),
+times the row count, inflated by the predict lane's queue depth. Time
+already spent waiting for admission is taken out of the budget. The first
+model that fits is used; if none does, the fastest one is, so traffic
+degrades to cheaper models under load instead of timing out.
+
+A model without enough recent samples (e.g. one traffic moved away from,
+whose samples expired) is re-measured by one probe request at a time per
+request size; meanwhile other requests stay on the last model that met the
+budget. Statistics are per process (each preforked worker measures its own
+traffic).
+"""
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .config import settings
+from .admission import admission_controller
+from .models import model_manager
+
+
+BUDGET_HEADER = "x-latency-budget-ms"
+MODEL_TYPES = ("rf", "lgbm")
+
+# A probe that never records (e.g. the prediction failed) stops blocking new probes after this
+PROBE_TIMEOUT_SECONDS = 10.0
+
+
+def _ms(value: Optional[float], scale: float = 1000) -> Optional[float]:
+    return round(value * scale, 3) if value is not None else None
+
+
+class ModelSelector:
+    """Live per-model latency windows and the budget-based choice"""
+
+    def __init__(self, window_seconds: Optional[float] = None, max_samples: int = 500):
+        self.window_seconds = window_seconds or settings.AUTO_STATS_WINDOW_SECONDS
+        # (model, row bucket) -> (monotonic time, seconds per row)
+        self._samples: Dict[Tuple[str, int], Deque[Tuple[float, float]]] = defaultdict(
+            lambda: deque(maxlen=max_samples)
+        )
+        self._lock = threading.Lock()
+        # (model, row bucket) -> monotonic start of the probe in flight
+        self._probes: Dict[Tuple[str, int], float] = {}
+        # Row bucket -> last model chosen on a measured estimate within budget
+        self._last_fit: Dict[int, str] = {}
+        self.choices: Dict[str, int] = {model: 0 for model in MODEL_TYPES}
+        self.probes = 0
+        self.over_budget = 0
+
+    # ==================== Latency statistics ====================
+
+    @staticmethod
+    def _bucket(rows: int) -> int:
+        # Per-row cost falls with batch size, so sizes are compared within powers of two
+        return max(rows, 1).bit_length()
+
+    def record(self, model_type: str, seconds: float, rows: int = 1):
+        """Record a served request's model time (any model_type, auto or not)"""
+        if model_type not in MODEL_TYPES or rows <= 0:
+            return
+        key = (model_type, self._bucket(rows))
+        with self._lock:
+            self._samples[key].append((time.monotonic(), seconds / rows))
+            self._probes.pop(key, None)
+
+    def _recent(self, model_type: str, bucket: int) -> List[float]:
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            samples = self._samples.get((model_type, bucket))
+            if samples is None:
+                return []
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+            return [per_row for _, per_row in samples]
+
+    def per_row_p90(self, model_type: str, rows: int = 1) -> Optional[float]:
+        """Recent p90 seconds per row for requests of about this many rows (None if too few samples)"""
+        recent = self._recent(model_type, self._bucket(rows))
+        if len(recent) < settings.AUTO_MIN_SAMPLES:
+            return None
+        recent.sort()
+        return recent[min(len(recent) - 1, int(0.9 * len(recent)))]
+
+    @staticmethod
+    def queue_factor() -> float:
+        """Latency multiplier from requests queueing for the predict lane"""
+        lane = admission_controller.lanes.get("predict")
+        if not settings.ADMISSION_ENABLED or lane is None:
+            return 1.0
+        return 1.0 + lane.waiting / max(lane.max_in_flight, 1)
+
+    # ==================== Choice ====================
+
+    @staticmethod
+    def ranking() -> List[str]:
+        """Models by held-out accuracy (PR-AUC, then ROC-AUC), best first"""
+        metadata = model_manager.metadata or {}
+        names = {"rf": "random_forest", "lgbm": "lightgbm"}
+
+        def score(model_type: str) -> Tuple[float, float]:
+            metrics = metadata.get("models", {}).get(names[model_type], {}).get("metrics", {})
+            return metrics.get("pr_auc", 0.0), metrics.get("roc_auc", 0.0)
+
+        return sorted(MODEL_TYPES, key=score, reverse=True)
+
+    def choose(self, budget_ms: Optional[float], rows: int = 1, waited_ms: float = 0.0) -> Tuple[str, Dict[str, Any]]:
+        """
+        Most accurate model whose expected latency fits the remaining budget
+
+        Args:
+            budget_ms: Client latency budget (default AUTO_DEFAULT_BUDGET_MS)
+            rows: Rows to score
+            waited_ms: Time already spent before the model call (admission queue)
+
+        Returns:
+            (model_type, selection details for the response)
+        """
+        budget_ms = budget_ms if budget_ms is not None else settings.AUTO_DEFAULT_BUDGET_MS
+        remaining_ms = budget_ms - waited_ms
+        factor = self.queue_factor()
+
+        estimates: Dict[str, Optional[float]] = {}
+        for model_type in MODEL_TYPES:
+            per_row = self.per_row_p90(model_type, rows)
+            # None: too few recent samples, so the model needs a probe
+            estimates[model_type] = per_row * rows * factor * 1000 if per_row is not None else None
+
+        bucket = self._bucket(rows)
+        ranking = self.ranking()
+        now = time.monotonic()
+        chosen = None
+        with self._lock:
+            for model in ranking:
+                estimate = estimates[model]
+                if estimate is not None:
+                    if estimate <= remaining_ms:
+                        chosen = model
+                        if model == ranking[0]:
+                            reason = "most accurate within budget"
+                        elif estimates[ranking[0]] is None:
+                            reason = f"{ranking[0]} is being re-measured"
+                        else:
+                            reason = f"{ranking[0]} expected over budget"
+                        self._last_fit[bucket] = model
+                        break
+                    continue
+                # Unmeasured: one probe at a time, so expired samples don't send every request back to it
+                started = self._probes.get((model, bucket))
+                if started is None or now - started > PROBE_TIMEOUT_SECONDS:
+                    self._probes[(model, bucket)] = now
+                    self.probes += 1
+                    chosen = model
+                    reason = f"probing {model} (too few recent samples)"
+                    break
+
+            if chosen is None:
+                # Every measured model is over budget, every other one is being probed
+                measured = [model for model in ranking if estimates[model] is not None]
+                last_fit = self._last_fit.get(bucket)
+                if measured:
+                    chosen = min(measured, key=lambda model: estimates[model])
+                    reason = "no model fits the budget; using the fastest"
+                    self.over_budget += 1
+                elif last_fit is not None:
+                    chosen = last_fit
+                    reason = "models being re-measured; staying on the last model within budget"
+                else:
+                    chosen = ranking[0]
+                    reason = "no latency samples yet"
+
+        self.choices[chosen] += 1
+        return chosen, {
+            "budget_ms": budget_ms,
+            "remaining_ms": round(remaining_ms, 3),
+            "queue_factor": round(factor, 3),
+            "estimates_ms": {model: _ms(value, 1) for model, value in estimates.items()},
+            "reason": reason,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_pid": os.getpid(),
+            "ranking": self.ranking(),
+            "window_seconds": self.window_seconds,
+            "queue_factor": self.queue_factor(),
+            "models": {
+                model: {
+                    "single_row_p90_ms": _ms(self.per_row_p90(model)),
+                    "recent_samples": {
+                        f"{2 ** (bucket - 1)}+ rows": len(self._recent(model, bucket))
+                        for bucket in sorted(b for m, b in list(self._samples) if m == model)
+                    },
+                    "auto_choices": self.choices[model],
+                }
+                for model in MODEL_TYPES
+            },
+            "probes": self.probes,
+            "probes_in_flight": len(self._probes),
+            "over_budget": self.over_budget,
+        }
+
+
+def budget_from_request(headers: Any, body_budget_ms: Optional[float]) -> Optional[float]:
+    """Budget from the body field, else the X-Latency-Budget-Ms header"""
+    if body_budget_ms is not None:
+        return body_budget_ms
+    value = headers.get(BUDGET_HEADER)
+    if value is None:
+        return None
+    try:
+        budget = float(value)
+    except ValueError:
+        raise ValueError(f"Invalid {BUDGET_HEADER} header: {value!r}")
+    if budget <= 0:
+        raise ValueError(f"{BUDGET_HEADER} must be positive")
+    return budget
+
+
+def waited_ms(request: Any) -> float:
+    """Milliseconds since the admission middleware saw the request (0 if it did not)"""
+    arrived = getattr(request.state, "arrived_at", None)
+    return (time.perf_counter() - arrived) * 1000 if arrived is not None else 0.0
+
+
+# Create global model selector instance
+model_selector = ModelSelector()
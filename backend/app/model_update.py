@@ -0,0 +1,349 @@
+"""
+Incremental Model Updates
+Continues boosting the LightGBM model on newly labeled KOIs
+
+Instead of a full notebook retrain, new CONFIRMED / FALSE POSITIVE rows are
+fed to LightGBM with the current booster as init_model, adding a few dozen
+trees on top of the existing ones. The candidate is scored next to the
+current model on the notebook's held-out split and only published, in the
+layout ModelManager loads, if ROC-AUC and PR-AUC stay within
+MODEL_UPDATE_MAX_METRIC_DROP.
+
+The held-out split is rebuilt once from the full catalog and its KOI names
+are persisted in MODEL_UPDATE_STATE_PATH, so later updates validate on the
+same rows the model was tested on (minus any that receive new labels, which
+leave the split once trained on). Update rounds lower LightGBM's leaf
+minimum to MODEL_UPDATE_MIN_CHILD_SAMPLES so a small batch can split at
+all; a candidate whose new trees never split is skipped as a no-op.
+
+New rows are found by diffing catalog labels against the labels the model
+has already seen (recorded in MODEL_UPDATE_STATE_PATH); the first run
+records a baseline. Alternatively pass a CSV of labeled rows with --labels.
+
+Usage (from project root):
+    python -m backend.app.model_update                  # diff catalog labels, update, publish
+    python -m backend.app.model_update --dry-run        # train and validate only
+    python -m backend.app.model_update --labels new_kois.csv --rounds 30
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .config import settings
+from .datasets import CATALOG_DATASETS, DatasetRegistry, dataset_registry
+from .evaluation import (
+    LABEL_COLUMN,
+    NEGATIVE_LABEL,
+    POSITIVE_LABEL,
+    held_out_split,
+    labeled_rows,
+    threshold_metrics,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+KEY_COLUMN = "kepoi_name"
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _bump_patch(version: str) -> str:
+    parts = str(version).split(".")
+    if len(parts) == 3 and parts[2].isdigit():
+        return ".".join(parts[:2] + [str(int(parts[2]) + 1)])
+    return f"{version}.1"
+
+
+def _summary_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Held-out metrics in the shape of metadata.json "metrics" """
+    default = metrics["default_threshold"]
+    return {
+        "accuracy": default["accuracy"],
+        "roc_auc": metrics["roc_auc"],
+        "pr_auc": metrics["pr_auc"],
+        "f1_score": default["f1_score"],
+        "precision": default["precision"],
+        "recall": default["recall"],
+    }
+
+
+class IncrementalUpdater:
+    """Builds, validates and publishes a continued-boosting LightGBM model"""
+
+    def __init__(
+        self,
+        registry: DatasetRegistry = dataset_registry,
+        dataset: Optional[str] = None,
+        rounds: Optional[int] = None,
+        learning_rate: Optional[float] = None,
+        max_metric_drop: Optional[float] = None,
+        min_rows: Optional[int] = None,
+    ):
+        self.registry = registry
+        self._dataset = dataset
+        self.rounds = rounds or settings.MODEL_UPDATE_ROUNDS
+        self.learning_rate = learning_rate or settings.MODEL_UPDATE_LEARNING_RATE
+        self.max_metric_drop = max_metric_drop if max_metric_drop is not None else settings.MODEL_UPDATE_MAX_METRIC_DROP
+        self.min_rows = min_rows or settings.MODEL_UPDATE_MIN_ROWS
+
+        self.model_path = Path(settings.LGBM_MODEL_PATH)
+        self.metadata_path = Path(settings.METADATA_PATH)
+        self.state_path = Path(settings.MODEL_UPDATE_STATE_PATH)
+        self.archive_dir = Path(settings.MODEL_ARCHIVE_DIR)
+
+    @property
+    def dataset(self) -> Optional[str]:
+        if not self.registry.entries:
+            self.registry.discover()
+        return self.registry.catalog(self._dataset)
+
+    # ==================== Label state ====================
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        if not self.state_path.exists():
+            return None
+        with open(self.state_path, 'r') as f:
+            return json.load(f)
+
+    def _save_state(self, dataset: str, labels: Dict[str, str], held_out: Dict[str, Any]):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json(self.state_path, {
+            "dataset": dataset,
+            "key": KEY_COLUMN,
+            "updated_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "labels": labels,
+            "held_out": held_out,
+        })
+
+    @staticmethod
+    def _catalog_labels(frame: "pd.DataFrame") -> Dict[str, str]:
+        labeled = frame[frame[LABEL_COLUMN].isin([POSITIVE_LABEL, NEGATIVE_LABEL])]
+        return dict(zip(labeled[KEY_COLUMN].astype(str), labeled[LABEL_COLUMN]))
+
+    @staticmethod
+    def _held_out_keys(catalog: "pd.DataFrame", features: List[str], metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """KOI names of the notebook's test split, rebuilt from the full catalog"""
+        X_test, _, reproduces = held_out_split(catalog, features, metadata)
+        return {
+            "keys": catalog.loc[X_test.index, KEY_COLUMN].astype(str).tolist(),
+            "reproduces_training_split": reproduces,
+            "recorded_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+
+    # ==================== Update ====================
+
+    def run(self, labels_path: Optional[Path] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Find new labeled rows, continue boosting, validate and publish
+
+        Args:
+            labels_path: CSV of newly labeled rows (default: diff catalog labels)
+            dry_run: Train and validate without publishing
+
+        Returns:
+            Summary with row counts, previous/candidate metrics and outcome
+        """
+        import joblib
+        import pandas as pd
+
+        start = time.perf_counter()
+        name = self.dataset
+        if name is None:
+            raise ValueError(f"No catalog dataset found (looked for {', '.join(CATALOG_DATASETS)})")
+        catalog = self.registry.get(name)
+        if KEY_COLUMN not in catalog.columns or LABEL_COLUMN not in catalog.columns:
+            raise ValueError(f"Dataset '{name}' needs {KEY_COLUMN} and {LABEL_COLUMN} columns")
+
+        with open(settings.FEATURES_PATH, 'r') as f:
+            features = json.load(f)['features']
+        with open(self.metadata_path, 'r') as f:
+            metadata = json.load(f)
+
+        current_labels = self._catalog_labels(catalog)
+        state = self._load_state()
+        # The split the model was tested on: persisted at baseline, never re-drawn from a changed catalog
+        held_out = (state or {}).get("held_out") or self._held_out_keys(catalog, features, metadata)
+
+        keys = catalog[KEY_COLUMN].astype(str)
+        if labels_path is not None:
+            new_rows = pd.read_csv(labels_path)
+            new_keys = set(new_rows[KEY_COLUMN].astype(str)) if KEY_COLUMN in new_rows.columns else set()
+        else:
+            if state is None:
+                self._save_state(name, current_labels, held_out)
+                return self._summary("baseline", start, rows=0,
+                                     message=f"Recorded {len(current_labels):,} labels as already seen by the model "
+                                             f"and {len(held_out['keys']):,} held-out KOIs")
+            seen = state.get("labels", {})
+            changed = keys.map(current_labels).notna() & (keys.map(current_labels) != keys.map(seen))
+            new_rows = catalog[changed.to_numpy()]
+            new_keys = set(keys[changed])
+
+        # Impute like training: medians over the labeled catalog
+        labeled = catalog[catalog[LABEL_COLUMN].isin([POSITIVE_LABEL, NEGATIVE_LABEL])]
+        medians = labeled.reindex(columns=features).apply(pd.to_numeric, errors='coerce').median()
+        X_new, y_new = labeled_rows(new_rows, features, medians)
+        if len(y_new) < self.min_rows:
+            return self._summary("skipped", start, rows=len(y_new),
+                                 message=f"{len(y_new)} new labeled rows, need at least {self.min_rows}")
+        if y_new.min() == y_new.max():
+            return self._summary("skipped", start, rows=len(y_new),
+                                 message="New rows contain only one class; nothing to learn a boundary from")
+
+        model = joblib.load(self.model_path)
+        train_start = time.perf_counter()
+        candidate, init_trees = self._continue_boosting(model, X_new, y_new)
+        train_seconds = round(time.perf_counter() - train_start, 3)
+        if self._split_trees(candidate, init_trees) == 0:
+            return self._summary("skipped", start, rows=len(y_new), train_seconds=train_seconds,
+                                 message="No new tree found a split; the update would not change predictions")
+
+        # Both models on the persisted held-out rows, none of which are new
+        test_keys = set(held_out["keys"]) - new_keys
+        X_test, y_test = labeled_rows(catalog[keys.isin(test_keys).to_numpy()], features, medians)
+        if len(y_test) == 0 or y_test.min() == y_test.max():
+            raise ValueError(f"Held-out split has {len(y_test)} labeled rows in '{name}'; needs both classes")
+        reproduces = held_out["reproduces_training_split"]
+        previous = threshold_metrics(y_test, model.predict_proba(X_test)[:, 1])
+        updated = threshold_metrics(y_test, candidate.predict_proba(X_test)[:, 1])
+
+        failures = [
+            f"{metric} {updated[metric]:.4f} < {previous[metric]:.4f} - {self.max_metric_drop}"
+            for metric in ("roc_auc", "pr_auc")
+            if updated[metric] < previous[metric] - self.max_metric_drop
+        ]
+        validation = {
+            "held_out_rows": int(len(y_test)),
+            "reproduces_training_split": reproduces,
+            "previous": _summary_metrics(previous),
+            "candidate": _summary_metrics(updated),
+            "passed": not failures,
+            "failures": failures,
+        }
+
+        if failures:
+            return self._summary("rejected", start, rows=len(y_new), validation=validation,
+                                 train_seconds=train_seconds, trees=candidate.booster_.num_trees())
+        if dry_run:
+            return self._summary("validated", start, rows=len(y_new), validation=validation,
+                                 train_seconds=train_seconds, trees=candidate.booster_.num_trees())
+
+        self._publish(candidate, metadata, updated, len(y_new), validation)
+        # Rows trained on are no longer held out
+        held_out = {**held_out, "keys": [key for key in held_out["keys"] if key not in new_keys]}
+        if labels_path is None:
+            self._save_state(name, {**state.get("labels", {}), **current_labels}, held_out)
+        elif state is not None:
+            self._save_state(state["dataset"], state.get("labels", {}), held_out)
+        return self._summary("published", start, rows=len(y_new), validation=validation,
+                             train_seconds=train_seconds, trees=candidate.booster_.num_trees())
+
+    def _continue_boosting(self, model, X: "pd.DataFrame", y) -> Tuple[Any, int]:
+        """Fit rounds more trees starting from the served booster; returns (candidate, trees continued from)"""
+        import lightgbm as lgb
+
+        init = model.booster_
+        best = getattr(model, "best_iteration_", None)
+        if best and best < init.current_iteration():
+            # Served predictions stop at best_iteration; continue from exactly that model
+            init = lgb.Booster(model_str=init.model_to_string(num_iteration=best))
+
+        params = {**model.get_params(), "n_estimators": self.rounds}
+        if self.learning_rate:
+            params["learning_rate"] = self.learning_rate
+        # Training's leaf minimum (default 20) leaves a batch of MODEL_UPDATE_MIN_ROWS nothing to split
+        params["min_child_samples"] = min(params.get("min_child_samples") or 20, settings.MODEL_UPDATE_MIN_CHILD_SAMPLES)
+        params["min_child_weight"] = min(params.get("min_child_weight") or 1e-3, 1e-3)
+        candidate = lgb.LGBMClassifier(**params)
+        candidate.fit(X, y, init_model=init)
+        return candidate, init.num_trees()
+
+    @staticmethod
+    def _split_trees(candidate, init_trees: int) -> int:
+        """Trees added by the update rounds that contain at least one split"""
+        # LightGBM stops adding trees once no leaf meets the split requirements
+        added = candidate.booster_.dump_model()["tree_info"][init_trees:]
+        return sum("split_index" in tree["tree_structure"] for tree in added)
+
+    def _publish(self, candidate, metadata: Dict[str, Any], metrics: Dict[str, Any], rows: int,
+                 validation: Dict[str, Any]):
+        """Archive the current model, then atomically replace model and metadata"""
+        import joblib
+
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(self.model_path, self.archive_dir / f"{self.model_path.stem}-{stamp}{self.model_path.suffix}")
+        shutil.copy2(self.metadata_path, self.archive_dir / f"{self.metadata_path.stem}-{stamp}{self.metadata_path.suffix}")
+
+        tmp = self.model_path.with_suffix(self.model_path.suffix + ".tmp")
+        joblib.dump(candidate, tmp)
+        os.replace(tmp, self.model_path)
+
+        lgbm = metadata.setdefault("models", {}).setdefault("lightgbm", {})
+        previous_version = lgbm.get("version", "1.0.0")
+        default = metrics["default_threshold"]
+        lgbm.update({
+            "version": _bump_patch(previous_version),
+            "metrics": _summary_metrics(metrics),
+            "confusion_matrix": default["confusion_matrix"],
+            "best_iteration": candidate.booster_.num_trees(),
+        })
+        lgbm.setdefault("updates", []).append({
+            "updated_utc": stamp,
+            "previous_version": previous_version,
+            "new_labeled_rows": rows,
+            "rounds": self.rounds,
+            "learning_rate": candidate.get_params()["learning_rate"],
+            "validation": validation,
+        })
+        _write_json(self.metadata_path, metadata)
+        print(f"✓ Published LightGBM {lgbm['version']} to {self.model_path}")
+
+    @staticmethod
+    def _summary(outcome: str, start: float, rows: int, **details) -> Dict[str, Any]:
+        return {
+            "outcome": outcome,
+            "new_labeled_rows": rows,
+            **details,
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Continue boosting the LightGBM model on newly labeled KOIs")
+    parser.add_argument("--dataset", default=None, help="Catalog dataset name (default: kepler, else kepler_sample)")
+    parser.add_argument("--labels", type=Path, default=None, help="CSV of newly labeled rows instead of diffing the catalog")
+    parser.add_argument("--rounds", type=int, default=None, help=f"Boosting rounds to add (default {settings.MODEL_UPDATE_ROUNDS})")
+    parser.add_argument("--learning-rate", type=float, default=None, help="Default: the current model's")
+    parser.add_argument("--dry-run", action="store_true", help="Validate without publishing")
+    args = parser.parse_args(argv)
+
+    updater = IncrementalUpdater(dataset=args.dataset, rounds=args.rounds, learning_rate=args.learning_rate)
+    summary = updater.run(labels_path=args.labels, dry_run=args.dry_run)
+
+    print(f"✓ {summary['outcome']}: {summary['new_labeled_rows']:,} new labeled rows in {summary['elapsed_seconds']}s")
+    if summary.get("message"):
+        print(f"  - {summary['message']}")
+    validation = summary.get("validation")
+    if validation:
+        for metric in ("roc_auc", "pr_auc", "accuracy"):
+            print(f"  - {metric}: {validation['previous'][metric]:.4f} → {validation['candidate'][metric]:.4f}")
+        for failure in validation["failures"]:
+            print(f"⚠️  {failure}")
+    if summary["outcome"] == "rejected":
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
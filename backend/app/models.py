@@ -1,14 +1,22 @@
 """
 Model Loading and Management
 Handles loading of ML models and feature metadata
+
+numpy, pandas, joblib, sklearn and lightgbm are imported on first model
+load rather than at module import, so the API can start serving health
+checks before the ML stack is in memory.
 """
-import joblib
 import json
-import numpy as np
-import pandas as pd
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Any
 from .config import settings
+from .startup import startup_report
+from .monitoring import feature_monitor
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ModelManager:
@@ -18,20 +26,45 @@ class ModelManager:
         self.rf_model = None
         self.lgbm_model = None
         self.features = None
+        self.feature_set = frozenset()
         self.metadata = None
+        self.versions: Dict[str, str] = {}
+        self.importances: Dict[str, Any] = {}
         self.models_loaded = False
+        self._loader = None
+        self._load_finished = threading.Event()
         
     def load_models(self) -> bool:
         """Load all models and metadata"""
         try:
+            # Import the ML stack explicitly so its cost is reported separately
+            with startup_report.phase("import_ml_libraries"):
+                import joblib
+                import numpy  # noqa: F401
+                import pandas  # noqa: F401
+                import sklearn.ensemble  # noqa: F401
+                import lightgbm  # noqa: F401
+            
             # Load models
+            start = time.perf_counter()
             self.rf_model = joblib.load(settings.RF_MODEL_PATH)
             self.lgbm_model = joblib.load(settings.LGBM_MODEL_PATH)
+            startup_report.record("model_load", time.perf_counter() - start)
+            self.versions = {
+                "rf": self._file_version(settings.RF_MODEL_PATH),
+                "lgbm": self._file_version(settings.LGBM_MODEL_PATH),
+            }
+            # RandomForest recomputes feature_importances_ over all trees on every access
+            self.importances = {
+                "rf": self.rf_model.feature_importances_,
+                "lgbm": self.lgbm_model.feature_importances_,
+            }
             
             # Load features
             with open(settings.FEATURES_PATH, 'r') as f:
                 features_data = json.load(f)
                 self.features = features_data['features']
+                self.feature_set = frozenset(self.features)
             
             # Load metadata
             with open(settings.METADATA_PATH, 'r') as f:
@@ -50,7 +83,77 @@ class ModelManager:
             self.models_loaded = False
             return False
     
-    def prepare_features(self, input_data: Dict[str, Any]) -> pd.DataFrame:
+    @staticmethod
+    def _file_version(path: Path) -> str:
+        """Version tag derived from model file size and modification time"""
+        stat = Path(path).stat()
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    
+    def get_model(self, model_type: str):
+        """Loaded estimator for "lgbm" or "rf" """
+        if not self.models_loaded:
+            raise ValueError("Models not loaded. Call load_models() first.")
+        if model_type == "lgbm":
+            return self.lgbm_model
+        if model_type == "rf":
+            return self.rf_model
+        raise ValueError(f"Unknown model type: {model_type}")
+    
+    def predict_proba(self, X: Any, model_type: str, early_exit: bool = True) -> Tuple[Any, Optional[Any]]:
+        """
+        Class probabilities, with early exit for the RandomForest when
+        RF_EARLY_EXIT_ENABLED is set (probabilities are then means over the
+        trees evaluated, not the full forest)
+        
+        Args:
+            early_exit: Allow early exit for this call (off where callers compare probabilities across rows)
+        
+        Returns:
+            (probabilities of shape (rows, 2), trees used per row or None)
+        """
+        model = self.get_model(model_type)
+        if model_type == "rf" and early_exit and settings.RF_EARLY_EXIT_ENABLED:
+            import numpy as np
+            from .forest import early_exit_proba
+            
+            confirmed, trees_used = early_exit_proba(
+                model, X, batch_size=settings.RF_EARLY_EXIT_BATCH_SIZE, tolerance=settings.RF_EARLY_EXIT_TOLERANCE
+            )
+            return np.column_stack([1 - confirmed, confirmed]), trees_used
+        return model.predict_proba(X), None
+    
+    def start_background_load(self, after: Optional[Callable[[], None]] = None):
+        """
+        Load models in a background thread (no-op if loaded or loading)
+        
+        Args:
+            after: Optional warm-up to run in the same thread once models are loaded
+        """
+        if self.models_loaded or (self._loader is not None and self._loader.is_alive()):
+            return
+        self._load_finished.clear()
+        self._loader = threading.Thread(target=self._background_load, args=(after,), name="model-loader", daemon=True)
+        self._loader.start()
+    
+    def _background_load(self, after: Optional[Callable[[], None]]):
+        try:
+            if not self.load_models():
+                print("⚠️  Warning: Models failed to load. Prediction endpoint will not work.")
+        finally:
+            self._load_finished.set()
+        if after is not None:
+            after()
+    
+    def wait_until_loaded(self, timeout: float) -> bool:
+        """Block until a background load finishes; True if models are loaded"""
+        if self.models_loaded:
+            return True
+        if self._loader is None:
+            return False
+        self._load_finished.wait(timeout)
+        return self.models_loaded
+    
+    def prepare_features(self, input_data: Dict[str, Any], observe: bool = True) -> "pd.DataFrame":
         """
         Prepare input data to match training features
         Handles missing features by filling with median or default values
@@ -58,6 +161,10 @@ class ModelManager:
         if not self.models_loaded:
             raise ValueError("Models not loaded")
         
+        # Record provided values and default fallbacks for drift monitoring
+        if observe:
+            feature_monitor.observe(input_data, self.feature_set)
+        
         # Create DataFrame with all required features
         feature_dict = {}
         
@@ -69,6 +176,8 @@ class ModelManager:
                 # In production, you might want to use training medians
                 feature_dict[feature] = 0.0
         
+        import pandas as pd
+        
         df = pd.DataFrame([feature_dict])
         return df
     
@@ -83,26 +192,16 @@ class ModelManager:
         Returns:
             Dictionary with prediction results
         """
-        if not self.models_loaded:
-            raise ValueError("Models not loaded. Call load_models() first.")
-        
-        # Select model
-        if model_type == "lgbm":
-            model = self.lgbm_model
-        elif model_type == "rf":
-            model = self.rf_model
-        else:
-            raise ValueError(f"Unknown model type: {model_type}")
-        
         # Prepare features
         X = self.prepare_features(input_data)
         
-        # Make prediction
-        prediction = model.predict(X)[0]
-        probabilities = model.predict_proba(X)[0]
+        # Make prediction (class from the same probabilities: one pass over the model)
+        probabilities, trees_used = self.predict_proba(X, model_type)
+        probabilities = probabilities[0]
+        prediction = int(probabilities.argmax())
         
-        # Get feature importances
-        feature_importance = model.feature_importances_
+        # Get feature importances (cached at load)
+        feature_importance = self.importances[model_type]
         
         # Get top features that were actually provided
         provided_features = [f for f in self.features if f in input_data]
@@ -127,11 +226,57 @@ class ModelManager:
             "probability_confirmed": float(probabilities[1]),
             "confidence": float(max(probabilities)),
             "model_used": model_type,
-            "top_features": top_features
+            "top_features": top_features,
+            "trees_used": int(trees_used[0]) if trees_used is not None else None
         }
         
         return result
     
+    def predict_batch(
+        self,
+        features: "pd.DataFrame",
+        model_type: str = "lgbm",
+        observe: bool = True,
+        early_exit: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Score a validated columnar batch in one call
+
+        Args:
+            features: Feature columns (NaN = missing, filled like prepare_features)
+            model_type: "lgbm" or "rf"
+            observe: Record the rows for input monitoring (off for synthetic sweeps)
+            early_exit: Allow RandomForest early exit (off for sweeps, whose points are compared)
+
+        Returns:
+            Columnar result: {"model_used", "n_rows", "columns": {name: array}}
+        """
+        import numpy as np
+        
+        if observe:
+            feature_monitor.observe_batch(
+                {name: features[name].to_numpy() for name in features.columns}, len(features), self.features
+            )
+        
+        X = features.reindex(columns=self.features).fillna(0.0)
+        probabilities, trees_used = self.predict_proba(X, model_type, early_exit=early_exit)
+        predicted = probabilities.argmax(axis=1)
+        
+        columns = {
+            "predicted_class": predicted.astype(np.int8),
+            "probability_false_positive": probabilities[:, 0],
+            "probability_confirmed": probabilities[:, 1],
+            "confidence": probabilities.max(axis=1),
+        }
+        if trees_used is not None:
+            columns["trees_used"] = trees_used.astype(np.int16)
+        
+        return {
+            "model_used": model_type,
+            "n_rows": len(X),
+            "columns": columns
+        }
+    
     def get_metadata(self) -> Dict[str, Any]:
         """Return metadata"""
         if not self.models_loaded:
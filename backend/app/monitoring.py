@@ -0,0 +1,272 @@
+"""
+Input Monitoring
+Constant-memory sketches of the feature values production traffic sends
+
+Each model feature gets a log-bucketed quantile sketch (DDSketch-style:
+quantiles within a fixed relative error, bucket count capped by collapsing
+the smallest magnitudes) plus a count of requests that left it out, i.e.
+where prepare_features fell back to the default value. Updates are O(1)
+per provided feature, so they run inline on every request.
+
+Sketches live in process memory: under the preforking server each worker
+keeps its own, and a report covers only the worker that served it
+(worker_pid in the report).
+"""
+import math
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Collection, Dict, Iterable, List, Optional
+
+from .config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+REPORT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def _finite(value: Any) -> Optional[float]:
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+class _Bins:
+    """Bucket counts for one sign; keys below floor were collapsed into it"""
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.floor: Optional[int] = None
+
+    def add(self, key: int, count: int, max_bins: int):
+        if self.floor is not None and key < self.floor:
+            key = self.floor
+        self.counts[key] = self.counts.get(key, 0) + count
+        if len(self.counts) > max_bins:
+            self._collapse(max_bins)
+
+    def _collapse(self, max_bins: int):
+        """Merge the lowest-magnitude buckets until within max_bins"""
+        keys = sorted(self.counts)
+        excess = len(keys) - max_bins
+        merged = sum(self.counts.pop(key) for key in keys[:excess])
+        self.floor = keys[excess]
+        self.counts[self.floor] += merged
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch with a bounded number of buckets
+
+    A value x lands in bucket ceil(log_gamma(|x|)); any quantile estimate is
+    then within relative_accuracy of the true value, as long as no buckets
+    had to be collapsed (collapsing only affects the lowest magnitudes).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.positive = _Bins()
+        self.negative = _Bins()
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self.log_gamma)
+
+    def _value(self, key: int) -> float:
+        # Midpoint (in relative terms) of bucket (gamma^(k-1), gamma^k]
+        return 2 * self.gamma ** key / (1 + self.gamma)
+
+    def add(self, value: float):
+        if value != value or math.isinf(value):  # NaN / inf
+            return
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value == 0:
+            self.zero_count += 1
+            return
+        bins = self.positive if value > 0 else self.negative
+        bins.add(self._key(abs(value)), 1, self.max_bins)
+
+    def add_many(self, values: "np.ndarray"):
+        """Vectorized add for a batch column"""
+        import numpy as np
+
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        self.count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.zero_count += int((values == 0).sum())
+        for bins, part in ((self.positive, values[values > 0]), (self.negative, -values[values < 0])):
+            if part.size == 0:
+                continue
+            keys, counts = np.unique(np.ceil(np.log(part) / self.log_gamma).astype(np.int64), return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                bins.add(key, count, self.max_bins)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        # Walk from most negative to most positive
+        for key in sorted(self.negative.counts, reverse=True):
+            seen += self.negative.counts[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive.counts):
+            seen += self.positive.counts[key]
+            if seen > rank:
+                return self._value(key)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.sum / self.count if self.count else None,
+            "quantiles": {f"p{int(q * 100):02d}": self.quantile(q) for q in REPORT_QUANTILES},
+            "bins": len(self.positive.counts) + len(self.negative.counts) + (1 if self.zero_count else 0),
+        }
+
+
+class FeatureMonitor:
+    """Per-feature sketches and default-fallback counts for /predict traffic"""
+
+    def __init__(self, relative_accuracy: Optional[float] = None, max_bins: Optional[int] = None):
+        self.relative_accuracy = relative_accuracy or settings.MONITORING_RELATIVE_ACCURACY
+        self.max_bins = max_bins or settings.MONITORING_MAX_BINS
+        self.requests = 0
+        self.sketches: Dict[str, QuantileSketch] = {}
+        self.provided: Dict[str, int] = {}
+        self._reference: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def _sketch(self, feature: str) -> QuantileSketch:
+        sketch = self.sketches.get(feature)
+        if sketch is None:
+            sketch = self.sketches[feature] = QuantileSketch(self.relative_accuracy, self.max_bins)
+        return sketch
+
+    def observe(self, input_data: Dict[str, Any], features: Collection[str]):
+        """Record one request's provided model features (features should be a set)"""
+        if not settings.MONITORING_ENABLED:
+            return
+        with self._lock:
+            self.requests += 1
+            for feature, value in input_data.items():
+                if value is None or feature not in features:
+                    continue
+                self.provided[feature] = self.provided.get(feature, 0) + 1
+                self._sketch(feature).add(float(value))
+
+    def observe_batch(self, columns: Dict[str, "np.ndarray"], n_rows: int, features: Iterable[str]):
+        """Record a validated columnar batch (NaN = not provided)"""
+        if not settings.MONITORING_ENABLED:
+            return
+        import numpy as np
+
+        with self._lock:
+            self.requests += n_rows
+            for feature in features:
+                values = columns.get(feature)
+                if values is None:
+                    continue
+                values = np.asarray(values, dtype=np.float64)
+                self.provided[feature] = self.provided.get(feature, 0) + int(np.isfinite(values).sum())
+                self._sketch(feature).add_many(values)
+
+    # ==================== Reporting ====================
+
+    def reference(self, metadata: Optional[Dict[str, Any]], features: List[str]) -> Dict[str, Any]:
+        """
+        Training-set reference distributions
+        Uses metadata.json "feature_distributions" when present, otherwise
+        quantiles of the Kepler catalog the model was trained from (computed once).
+        """
+        if metadata and metadata.get("feature_distributions"):
+            return {"source": "metadata.json", "features": metadata["feature_distributions"]}
+        if self._reference is None:
+            self._reference = self._catalog_reference(features)
+        return self._reference
+
+    @staticmethod
+    def _catalog_reference(features: List[str]) -> Dict[str, Any]:
+        import pandas as pd
+        from .datasets import dataset_registry
+        from .similarity import similarity_index
+
+        name = similarity_index.dataset
+        if name is None:
+            return {"source": None, "features": {}}
+        frame = dataset_registry.get(name)
+        numeric = frame.reindex(columns=features).apply(pd.to_numeric, errors='coerce')
+        quantiles = numeric.quantile(list(REPORT_QUANTILES))
+        reference = {}
+        for feature in features:
+            column = numeric[feature]
+            reference[feature] = {
+                "count": int(column.notna().sum()),
+                "missing_rate": float(column.isna().mean()),
+                "quantiles": {
+                    f"p{int(q * 100):02d}": _finite(quantiles.at[q, feature]) for q in REPORT_QUANTILES
+                },
+            }
+        return {"source": f"dataset:{name}", "features": reference}
+
+    def report(self, features: List[str], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._lock:
+            requests = self.requests
+            live = {feature: (self.provided.get(feature, 0), self.sketches.get(feature)) for feature in features}
+            summaries = {feature: sketch.summary() for feature, (_, sketch) in live.items() if sketch is not None}
+
+        reference = self.reference(metadata, features)
+        report = {}
+        for feature in features:
+            provided, _ = live[feature]
+            summary = summaries.get(feature)
+            ref = reference["features"].get(feature) or {}
+            entry = {
+                "provided": provided,
+                "defaulted": requests - provided,
+                "defaulted_rate": (requests - provided) / requests if requests else None,
+                "live": summary,
+                "reference": ref or None,
+                "median_shift": None,
+            }
+            # Shift of the live median in units of the reference IQR
+            ref_q = ref.get("quantiles") or {}
+            if summary and summary["quantiles"]["p50"] is not None and None not in (
+                ref_q.get("p25"), ref_q.get("p50"), ref_q.get("p75")
+            ):
+                iqr = ref_q["p75"] - ref_q["p25"]
+                if iqr:
+                    entry["median_shift"] = (summary["quantiles"]["p50"] - ref_q["p50"]) / iqr
+            report[feature] = entry
+
+        return {
+            "worker_pid": os.getpid(),
+            "requests": requests,
+            "relative_accuracy": self.relative_accuracy,
+            "reference_source": reference["source"],
+            "features": report,
+        }
+
+
+# Create global feature monitor instance
+feature_monitor = FeatureMonitor()
@@ -0,0 +1,378 @@
+"""
+Prediction Log
+Append-only audit trail of predictions, written off the request path
+
+Endpoints append records to an in-memory buffer bounded at
+PREDICTION_LOG_BUFFER_SIZE rows (a batch counts as its row count; appending
+never waits on disk; if the writer falls behind the oldest entries are
+dropped and their rows counted). A background thread drains it every
+PREDICTION_LOG_FLUSH_INTERVAL_SECONDS, or sooner once
+PREDICTION_LOG_FLUSH_ROWS rows are waiting, and appends one columnar
+frame per batch to logs/predictions/. Files rotate at
+PREDICTION_LOG_MAX_FILE_MB.
+
+Frame layout: 4-byte magic, uint32 payload length, zlib-compressed JSON
+{"n_rows", "columns", "constants"}. A frame cut short by a crash is ignored
+by the reader.
+
+Usage (from project root):
+    python -m backend.app.prediction_log                # summary of all logs
+    python -m backend.app.prediction_log --csv out.csv  # export to CSV
+"""
+import argparse
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .config import settings
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+MAGIC = b"FXPL"
+HEADER = struct.Struct("<4sI")
+FILE_SUFFIX = ".plog"
+
+# Written per single-prediction record, in this order
+RECORD_FIELDS = (
+    "timestamp",
+    "endpoint",
+    "model_used",
+    "model_version",
+    "latency_ms",
+    "predicted_class",
+    "probability_confirmed",
+)
+INPUT_PREFIX = "input_"
+
+
+def encode_frame(columns: Dict[str, List[Any]], n_rows: int, constants: Optional[Dict[str, Any]] = None) -> bytes:
+    payload = zlib.compress(
+        json.dumps({"n_rows": n_rows, "columns": columns, "constants": constants or {}}).encode(), 6
+    )
+    return HEADER.pack(MAGIC, len(payload)) + payload
+
+
+class PredictionLog:
+    """Row-bounded buffer plus background writer for prediction records"""
+
+    def __init__(
+        self,
+        log_dir: Optional[Path] = None,
+        buffer_size: Optional[int] = None,
+        flush_rows: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_file_bytes: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.log_dir = Path(log_dir or settings.PREDICTION_LOG_DIR)
+        self.buffer_size = buffer_size or settings.PREDICTION_LOG_BUFFER_SIZE
+        self.flush_rows = flush_rows or settings.PREDICTION_LOG_FLUSH_ROWS
+        self.flush_interval = flush_interval or settings.PREDICTION_LOG_FLUSH_INTERVAL_SECONDS
+        self.max_file_bytes = max_file_bytes or settings.PREDICTION_LOG_MAX_FILE_MB * 1024 * 1024
+        self.enabled = settings.PREDICTION_LOG_ENABLED if enabled is None else enabled
+
+        # Entries are (item, rows); _buffered_rows is the sum, kept <= buffer_size
+        self._buffer: deque = deque()
+        self._buffered_rows = 0
+        self._buffer_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._file = None
+        self._file_seq = 0
+
+        self.recorded = 0
+        self.dropped_rows = 0
+        self.written_rows = 0
+        self.written_bytes = 0
+        self.flushes = 0
+        self.write_errors = 0
+        self.current_path: Optional[Path] = None
+
+    # ==================== Request path ====================
+
+    def _append(self, item: Any, rows: int):
+        with self._buffer_lock:
+            # Make room by dropping the oldest entries
+            while self._buffer and self._buffered_rows + rows > self.buffer_size:
+                _, dropped = self._buffer.popleft()
+                self._buffered_rows -= dropped
+                self.dropped_rows += dropped
+            self._buffer.append((item, rows))
+            self._buffered_rows += rows
+            self.recorded += rows
+            waiting = self._buffered_rows
+        self._ensure_writer()
+        if waiting >= self.flush_rows:
+            self._wake.set()
+
+    def record(
+        self,
+        input_data: Dict[str, Any],
+        result: Dict[str, Any],
+        model_version: Optional[str],
+        latency_seconds: float,
+        endpoint: str = "predict",
+    ):
+        """Log one prediction (O(1), never touches disk)"""
+        if not self.enabled:
+            return
+        self._append(
+            (
+                time.time(),
+                endpoint,
+                result["model_used"],
+                model_version,
+                latency_seconds * 1000,
+                result["predicted_class"],
+                result["probability_confirmed"],
+                input_data,
+            ),
+            1,
+        )
+
+    def record_batch(
+        self,
+        features: "pd.DataFrame",
+        result: Dict[str, Any],
+        model_version: Optional[str],
+        latency_seconds: float,
+        endpoint: str = "predict_batch",
+    ):
+        """Log a scored columnar batch as one block (columns are kept by reference)"""
+        if not self.enabled:
+            return
+        n_rows = result["n_rows"]
+        columns = result["columns"]
+        if n_rows > self.buffer_size:
+            # Larger than the whole buffer: keep the newest rows, like any other overflow
+            self.recorded += n_rows - self.buffer_size
+            self.dropped_rows += n_rows - self.buffer_size
+            features = features.iloc[-self.buffer_size:]
+            columns = {name: values[-self.buffer_size:] for name, values in columns.items()}
+            n_rows = self.buffer_size
+        self._append(
+            {
+                "n_rows": n_rows,
+                "inputs": features,
+                "columns": columns,
+                "constants": {
+                    "timestamp": time.time(),
+                    "endpoint": endpoint,
+                    "model_used": result["model_used"],
+                    "model_version": model_version,
+                    "latency_ms": latency_seconds * 1000,
+                },
+            },
+            n_rows,
+        )
+
+    # ==================== Writer ====================
+
+    def _ensure_writer(self):
+        # Threads do not survive fork: each preforked worker starts its own
+        if self._writer is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._writer is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._file = None
+            self._writer = threading.Thread(target=self._run, name="prediction-log-writer", daemon=True)
+            self._writer.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _frames(self) -> Iterator[Tuple[bytes, int]]:
+        """Drain the buffer into (frame, rows): consecutive single records share one frame"""
+        records = []
+        while True:
+            with self._buffer_lock:
+                if not self._buffer:
+                    break
+                item, rows = self._buffer.popleft()
+                self._buffered_rows -= rows
+            if isinstance(item, tuple):
+                records.append(item)
+                continue
+            if records:
+                yield self._record_frame(records), len(records)
+                records = []
+            yield self._block_frame(item), item["n_rows"]
+        if records:
+            yield self._record_frame(records), len(records)
+
+    @staticmethod
+    def _record_frame(records: List[tuple]) -> bytes:
+        columns: Dict[str, List[Any]] = {
+            name: [record[i] for record in records] for i, name in enumerate(RECORD_FIELDS)
+        }
+        inputs = [record[-1] for record in records]
+        for feature in sorted({feature for row in inputs for feature in row}):
+            columns[INPUT_PREFIX + feature] = [row.get(feature) for row in inputs]
+        return encode_frame(columns, len(records))
+
+    @staticmethod
+    def _block_frame(block: Dict[str, Any]) -> bytes:
+        columns = {name: values.tolist() for name, values in block["columns"].items()}
+        inputs = block["inputs"]
+        for feature in inputs.columns:
+            # NaN (not provided) → null
+            columns[INPUT_PREFIX + feature] = inputs[feature].astype(object).where(inputs[feature].notna(), None).tolist()
+        return encode_frame(columns, block["n_rows"], block["constants"])
+
+    def _open(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._file_seq += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        self.current_path = self.log_dir / f"predictions-{stamp}-{os.getpid()}-{self._file_seq}{FILE_SUFFIX}"
+        self._file = open(self.current_path, "ab")
+
+    def flush(self):
+        """Write everything buffered so far (called by the writer thread)"""
+        frames = list(self._frames())
+        if not frames:
+            return
+        data = b"".join(frame for frame, _ in frames)
+        try:
+            if self._file is None:
+                self._open()
+            self._file.write(data)
+            self._file.flush()
+            self.written_bytes += len(data)
+            self.written_rows += sum(rows for _, rows in frames)
+            self.flushes += 1
+            if self._file.tell() >= self.max_file_bytes:
+                self._file.close()
+                self._file = None
+        except OSError as e:
+            self.write_errors += 1
+            print(f"⚠️  Prediction log write failed: {e}")
+            self._file = None
+
+    def close(self):
+        """Stop the writer and flush what is left (on shutdown)"""
+        self._stopping = True
+        self._wake.set()
+        if self._writer is not None and self._pid == os.getpid():
+            self._writer.join(timeout=5)
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "log_dir": str(self.log_dir),
+            "current_file": str(self.current_path) if self.current_path else None,
+            "buffer_size": self.buffer_size,
+            "buffered_rows": self._buffered_rows,
+            "recorded_rows": self.recorded,
+            "written_rows": self.written_rows,
+            "written_bytes": self.written_bytes,
+            "flushes": self.flushes,
+            "dropped_rows": self.dropped_rows,
+            "write_errors": self.write_errors,
+        }
+
+
+# ==================== Reading ====================
+
+def iter_frames(path: Path) -> Iterator[Dict[str, Any]]:
+    """Decoded frames of one log file; stops at a truncated or corrupt frame"""
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            magic, length = HEADER.unpack(header)
+            payload = f.read(length)
+            if magic != MAGIC or len(payload) < length:
+                return
+            try:
+                yield json.loads(zlib.decompress(payload))
+            except (zlib.error, ValueError):
+                return
+
+
+def log_files(path: Optional[Union[str, Path]] = None) -> List[Path]:
+    path = Path(path or settings.PREDICTION_LOG_DIR)
+    if path.is_file():
+        return [path]
+    return sorted(path.glob(f"*{FILE_SUFFIX}"))
+
+
+def read_prediction_log(path: Optional[Union[str, Path]] = None) -> "pd.DataFrame":
+    """
+    Load prediction logs into a DataFrame
+
+    Args:
+        path: A log file or directory (default: PREDICTION_LOG_DIR)
+
+    Returns:
+        One row per prediction, ordered by time; input features as input_<name>
+    """
+    import pandas as pd
+
+    frames = []
+    for file in log_files(path):
+        for frame in iter_frames(file):
+            df = pd.DataFrame(frame["columns"], index=range(frame["n_rows"]))
+            for name, value in frame["constants"].items():
+                df[name] = value
+            frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=list(RECORD_FIELDS))
+
+    df = pd.concat(frames, ignore_index=True, sort=False)
+    leading = [col for col in RECORD_FIELDS if col in df.columns]
+    df = df[leading + sorted(col for col in df.columns if col not in leading)]
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s", utc=True)
+    return df.sort_values("timestamp", kind="mergesort").reset_index(drop=True)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Summarize or export prediction logs")
+    parser.add_argument("path", nargs="?", default=None, help=f"Log file or directory (default: {settings.PREDICTION_LOG_DIR})")
+    parser.add_argument("--csv", default=None, help="Write all records to this CSV file")
+    args = parser.parse_args(argv)
+
+    df = read_prediction_log(args.path)
+    if df.empty:
+        print(f"⚠️  No prediction logs found in {args.path or settings.PREDICTION_LOG_DIR}")
+        return
+
+    print(f"✓ {len(df):,} predictions from {df['timestamp'].min()} to {df['timestamp'].max()}")
+    for (endpoint, model), group in df.groupby(["endpoint", "model_used"]):
+        print(
+            f"  - {endpoint} / {model}: {len(group):,} rows, "
+            f"P(confirmed) mean {group['probability_confirmed'].mean():.3f}, "
+            f"latency p50 {group['latency_ms'].median():.1f}ms"
+        )
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+        print(f"✓ Wrote {args.csv}")
+
+
+# Create global prediction log instance
+prediction_log = PredictionLog()
+
+
+if __name__ == "__main__":
+    main()
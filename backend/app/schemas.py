@@ -5,11 +5,14 @@ from pydantic import BaseModel, Field, validator
 from typing import Dict, List, Optional, Any
 from enum import Enum
 
+from .config import settings
+
 
 class ModelType(str, Enum):
     """Available model types"""
     RANDOM_FOREST = "rf"
     LIGHTGBM = "lgbm"
+    AUTO = "auto"  # most accurate model within the latency budget
 
 
 class PredictionInput(BaseModel):
@@ -43,6 +46,12 @@ class PredictionInput(BaseModel):
     
     # Model selection
     model_type: Optional[ModelType] = Field(ModelType.LIGHTGBM, description="Model to use for prediction")
+    latency_budget_ms: Optional[float] = Field(
+        None, gt=0, description="Latency budget for model_type auto (or send an X-Latency-Budget-Ms header)"
+    )
+    
+    # Optional nearest catalog KOIs
+    similar_k: Optional[int] = Field(None, ge=1, le=settings.SIMILARITY_MAX_K, description="Also return this many most similar catalog KOIs")
     
     class Config:
         json_schema_extra = {
@@ -73,6 +82,9 @@ class PredictionOutput(BaseModel):
     confidence: float = Field(..., description="Confidence score (max probability)")
     model_used: str = Field(..., description="Model used for prediction (rf or lgbm)")
     top_features: List[Dict[str, Any]] = Field(..., description="Top contributing features")
+    similar: Optional[List[Dict[str, Any]]] = Field(None, description="Most similar catalog KOIs (when similar_k is set)")
+    trees_used: Optional[int] = Field(None, description="RandomForest trees evaluated before the vote settled (rf only)")
+    selection: Optional[Dict[str, Any]] = Field(None, description="Budget, latency estimates and reason (model_type auto only)")
     
     class Config:
         json_schema_extra = {
@@ -152,3 +164,127 @@ class StatsResponse(BaseModel):
                 }
             }
         }
+
+
+class DatasetInfo(BaseModel):
+    """A dataset discovered by the registry"""
+    name: str = Field(..., description="Dataset name used by /dataset?name=")
+    kind: str = Field(..., description="Source folder (sample, clean, ...)")
+    path: str = Field(..., description="File path on the server")
+    loaded: bool = Field(..., description="Whether the dataset is resident in memory")
+    version: Optional[str] = Field(None, description="Version tag of the loaded data")
+    rows: Optional[int] = Field(None, description="Row count (when loaded)")
+    columns: Optional[int] = Field(None, description="Column count (when loaded)")
+
+
+class DatasetListResponse(BaseModel):
+    """Available datasets"""
+    datasets: List[DatasetInfo]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "datasets": [
+                    {"name": "kepler_sample", "kind": "sample", "path": "data/sample/kepler_sample.csv",
+                     "loaded": True, "version": "18c2f-7a3b1", "rows": 500, "columns": 122},
+                    {"name": "tess", "kind": "clean", "path": "data/clean/tess_clean.csv",
+                     "loaded": False, "version": None, "rows": None, "columns": None}
+                ]
+            }
+        }
+
+
+class SimilarityRequest(BaseModel):
+    """Batch of candidates to look up in the similarity index"""
+    inputs: List[PredictionInput] = Field(..., min_length=1, max_length=1000, description="Candidates to match")
+    k: int = Field(5, ge=1, le=settings.SIMILARITY_MAX_K, description="Neighbours per candidate")
+
+
+class SimilarityResponse(BaseModel):
+    """Nearest catalog KOIs for each submitted candidate"""
+    dataset: str = Field(..., description="Catalog the index was built from")
+    version: str = Field(..., description="Dataset version the index reflects")
+    k: int = Field(..., description="Neighbours per candidate")
+    results: List[List[Dict[str, Any]]] = Field(..., description="Neighbours per input, nearest first")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "dataset": "kepler_sample",
+                "version": "18c2f-7a3b1",
+                "k": 2,
+                "results": [[
+                    {"kepoi_name": "K00752.01", "kepid": 10797460, "koi_disposition": "CONFIRMED",
+                     "koi_period": 9.488, "koi_prad": 2.26, "distance": 1.84},
+                    {"kepoi_name": "K01234.01", "kepid": 11100000, "koi_disposition": "FALSE POSITIVE",
+                     "koi_period": 11.9, "koi_prad": 1.7, "distance": 2.31}
+                ]]
+            }
+        }
+
+
+class ConeSearchResponse(BaseModel):
+    """Dataset rows within an angular radius of a sky position"""
+    dataset: str = Field(..., description="Dataset searched")
+    version: str = Field(..., description="Dataset version the index reflects")
+    ra: float = Field(..., description="Cone center right ascension (degrees)")
+    dec: float = Field(..., description="Cone center declination (degrees)")
+    radius_arcsec: float = Field(..., description="Cone radius (arcseconds)")
+    count: int = Field(..., description="Rows inside the cone (before limit)")
+    matches: List[Dict[str, Any]] = Field(..., description="Identifiers, ra/dec, row and separation_arcsec, nearest first")
+
+
+class CrossMatchResponse(BaseModel):
+    """Source/target row pairs within an angular radius"""
+    source: str = Field(..., description="Dataset whose positions were looked up")
+    source_version: str = Field(..., description="Source dataset version")
+    target: str = Field(..., description="Dataset searched around each source position")
+    target_version: str = Field(..., description="Target dataset version")
+    radius_arcsec: float = Field(..., description="Match radius (arcseconds)")
+    nearest_only: bool = Field(..., description="Only the closest target per source row")
+    source_rows: int = Field(..., description="Source rows with valid positions")
+    matched_source_rows: int = Field(..., description="Source rows with at least one match")
+    count: int = Field(..., description="Pairs found (before limit)")
+    pairs: List[Dict[str, Any]] = Field(..., description="Pairs ordered by source row, then separation")
+    elapsed_seconds: float = Field(..., description="Time taken by the match")
+
+
+class SweepAxis(BaseModel):
+    """One swept feature: explicit values, or num points from start to stop"""
+    feature: str = Field(..., description="Model feature to vary, e.g. koi_period")
+    values: Optional[List[float]] = Field(None, max_length=1000, description="Explicit grid values")
+    start: Optional[float] = Field(None, description="First grid value (when values is not given)")
+    stop: Optional[float] = Field(None, description="Last grid value (when values is not given)")
+    num: int = Field(50, ge=2, le=1000, description="Number of grid points between start and stop")
+    log: bool = Field(False, description="Space points geometrically (for period, depth, ...)")
+
+
+class SweepRequest(BaseModel):
+    """What-if sweep around a base candidate"""
+    base: PredictionInput = Field(..., description="Candidate whose other features stay fixed")
+    axes: List[SweepAxis] = Field(..., min_length=1, max_length=2, description="One axis for a curve, two for a surface")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "base": {
+                    "koi_period": 12.34,
+                    "koi_duration": 3.1,
+                    "koi_prad": 1.2,
+                    "koi_depth": 1200.0,
+                    "model_type": "lgbm"
+                },
+                "axes": [{"feature": "koi_period", "start": 0.5, "stop": 500, "num": 100, "log": True}]
+            }
+        }
+
+
+class SweepResponse(BaseModel):
+    """Probability curve (one axis) or surface (two axes) from a single batched inference"""
+    model_used: str = Field(..., description="Model used for prediction (rf or lgbm)")
+    features: List[str] = Field(..., description="Swept features, in axis order")
+    grid: Dict[str, List[float]] = Field(..., description="Grid values per swept feature")
+    shape: List[int] = Field(..., description="Points per axis")
+    probability_confirmed: List[Any] = Field(
+        ..., description="P(CONFIRMED) per grid point; surface[i][j] is (axis 0 value i, axis 1 value j)"
+    )
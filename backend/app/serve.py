@@ -0,0 +1,252 @@
+"""
+Preforking Server
+Loads models and datasets once, then forks uvicorn workers that share them
+
+Running `uvicorn --workers N` makes every worker import pandas, sklearn and
+lightgbm and run load_models() in its own lifespan. Here the parent process
+does that work once, freezes the loaded objects out of the garbage
+collector's reach (so workers don't dirty shared pages by touching them)
+and forks workers onto a shared listening socket. Memory pages stay shared
+copy-on-write; workers that exit unexpectedly are replaced.
+
+The socket is bound before preloading, and until the workers start the
+parent answers on it itself: /health returns 200 with models_loaded false
+(so platform health checks pass during a cold start) and every other path
+returns 503 with Retry-After.
+
+The worker count is --workers, else WORKERS, else WEB_CONCURRENCY (set by
+hosting platforms), else the CPUs the container may actually use: the CPU
+affinity mask capped by the cgroup CPU quota, which os.cpu_count() and
+the affinity mask both ignore.
+
+Usage (from project root):
+    python -m backend.app.serve --host 0.0.0.0 --port 8000 [--workers N]
+"""
+import argparse
+import gc
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import uvicorn
+
+from .config import settings
+
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_CPU_DIR = Path("/sys/fs/cgroup/cpu")
+
+
+def cgroup_cpu_quota() -> Optional[float]:
+    """CPUs' worth of time the cgroup quota allows (cgroup v2, then v1); None if unlimited"""
+    try:
+        quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+        return int(quota) / int(period) if quota != "max" else None
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int((CGROUP_V1_CPU_DIR / "cpu.cfs_quota_us").read_text())
+        period = int((CGROUP_V1_CPU_DIR / "cpu.cfs_period_us").read_text())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: affinity mask, capped by the container's CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        # A fractional quota rounds down: more workers than CPUs' worth of time only adds throttling
+        cpus = min(cpus, max(1, int(quota)))
+    return cpus
+
+
+def preload():
+    """Import the app and load everything workers should share"""
+    from .main import app, warm_up_datasets
+    from .models import model_manager
+    from .datasets import dataset_registry
+
+    if not model_manager.load_models():
+        print("⚠️  Warning: Models failed to load. Prediction endpoint will not work.")
+
+    dataset_registry.discover()
+    warm_up_datasets()
+    return app
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class StartupResponder:
+    """Minimal HTTP answers on the listening socket while the parent preloads"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="startup-responder", daemon=True)
+        self.answered = 0
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Stop answering and hand the socket over (call before forking)"""
+        self._stop.set()
+        self._thread.join()
+        self.sock.settimeout(None)
+
+    def _run(self):
+        self.sock.settimeout(0.2)
+        while not self._stop.is_set():
+            try:
+                conn, _ = self.sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                self._answer(conn)
+            except OSError:
+                pass
+            finally:
+                conn.close()
+
+    def _answer(self, conn: socket.socket):
+        conn.settimeout(1.0)
+        request_line = conn.recv(4096).split(b"\r\n", 1)[0].decode("latin-1")
+        parts = request_line.split()
+        path = parts[1].split("?")[0] if len(parts) > 1 else ""
+
+        headers = "content-type: application/json\r\nconnection: close\r\n"
+        if path == f"{settings.API_V1_PREFIX}/health":
+            status = "200 OK"
+            body = {"status": "starting", "version": settings.VERSION, "models_loaded": False}
+        else:
+            status = "503 Service Unavailable"
+            body = {"detail": "Server is starting. Retry shortly."}
+            headers += f"retry-after: {settings.ADMISSION_RETRY_AFTER_SECONDS}\r\n"
+        payload = json.dumps(body).encode()
+        conn.sendall(
+            f"HTTP/1.1 {status}\r\n{headers}content-length: {len(payload)}\r\n\r\n".encode() + payload
+        )
+        self.answered += 1
+
+
+class Arbiter:
+    """Forks workers on a shared socket and replaces the ones that die"""
+
+    def __init__(self, app, sock: socket.socket, workers: int, log_level: str = "info"):
+        self.app = app
+        self.sock = sock
+        self.num_workers = workers
+        self.log_level = log_level
+        self.workers: Dict[int, int] = {}  # pid → worker slot
+        self.shutting_down = False
+        self.restarts = 0
+
+    def spawn(self, slot: int):
+        pid = os.fork()
+        if pid == 0:
+            # Worker: uvicorn installs its own SIGINT/SIGTERM handling
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            code = 0
+            try:
+                config = uvicorn.Config(self.app, log_level=self.log_level, lifespan="on")
+                uvicorn.Server(config).run(sockets=[self.sock])
+            except BaseException as e:
+                print(f"Worker {os.getpid()} crashed: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = slot
+        print(f"✓ Worker {slot} started (pid {pid})")
+
+    def stop(self, signum, frame):
+        self.shutting_down = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        for slot in range(self.num_workers):
+            self.spawn(slot)
+
+        recent_restarts = []
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            slot = self.workers.pop(pid, None)
+            if slot is None or self.shutting_down:
+                continue
+
+            print(f"⚠️  Worker {slot} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+            # Back off if workers are crash-looping
+            now = time.monotonic()
+            recent_restarts = [t for t in recent_restarts if now - t < 60] + [now]
+            if len(recent_restarts) > self.num_workers * 3:
+                time.sleep(1)
+            self.restarts += 1
+            self.spawn(slot)
+
+        print("\n👋 All workers stopped")
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Serve the API from preforked workers sharing preloaded models")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=settings.WORKERS, help="Default: WEB_CONCURRENCY, else available CPUs (cgroup quota aware)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or settings.WEB_CONCURRENCY or available_cpus()
+    print(f"\n🚀 Preforking {settings.PROJECT_NAME} with {workers} worker(s) on {args.host}:{args.port}")
+
+    sock = bind_socket(args.host, args.port)
+    responder = StartupResponder(sock)
+    responder.start()
+    try:
+        app = preload()
+    finally:
+        responder.stop()
+    print(f"✓ Preload finished ({responder.answered} request(s) answered while starting)")
+
+    # Move everything allocated so far to the permanent generation: the
+    # collector then never writes to those objects, keeping pages shared.
+    gc.collect()
+    gc.freeze()
+
+    Arbiter(app, sock, workers, log_level=args.log_level).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Shadow Evaluation
+Scores a sample of live /predict traffic with a candidate model, off the request path
+
+A fraction (SHADOW_SAMPLE_RATE) of requests is handed to a bounded queue
+with a non-blocking put; a single daemon thread scores them with the
+candidate model (SHADOW_MODEL_PATH) and records disagreement with the
+primary prediction and both latencies, keyed by the primary's model_used
+(for model_type auto, the model it resolved to). Submission runs as a
+background task after the response is sent. When the queue is full or the
+predict lane is already queueing requests, shadow work is dropped and
+counted rather than delayed, so the primary path never waits on it.
+Counters are per process (each preforked worker samples its own traffic).
+"""
+import os
+import queue
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .config import settings
+from .admission import admission_controller
+from .models import model_manager
+from .monitoring import QuantileSketch
+
+
+class _Comparison:
+    """Shadow vs primary counters for one primary model"""
+
+    def __init__(self):
+        self.evaluated = 0
+        self.disagreements = 0
+        self.abs_probability_diff = 0.0
+        self.primary_latency = QuantileSketch(relative_accuracy=0.01)
+        self.shadow_latency = QuantileSketch(relative_accuracy=0.01)
+
+    def summary(self) -> Dict[str, Any]:
+        primary = self.primary_latency.summary()
+        shadow = self.shadow_latency.summary()
+        return {
+            "evaluated": self.evaluated,
+            "disagreements": self.disagreements,
+            "disagreement_rate": self.disagreements / self.evaluated if self.evaluated else None,
+            "mean_abs_probability_diff": self.abs_probability_diff / self.evaluated if self.evaluated else None,
+            "latency_ms": {
+                "primary": {"mean": primary["mean"], **primary["quantiles"]},
+                "shadow": {"mean": shadow["mean"], **shadow["quantiles"]},
+            },
+        }
+
+
+class ShadowEvaluator:
+    """Background comparison of a candidate model against the served one"""
+
+    def __init__(
+        self,
+        model_path: Optional[Path] = None,
+        sample_rate: Optional[float] = None,
+        queue_size: Optional[int] = None,
+    ):
+        self.model_path = Path(model_path) if model_path else settings.SHADOW_MODEL_PATH
+        self.sample_rate = sample_rate if sample_rate is not None else settings.SHADOW_SAMPLE_RATE
+        self.queue_size = queue_size or settings.SHADOW_QUEUE_SIZE
+        self.model = None
+        self.load_error: Optional[str] = None
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.sampled = 0
+        self.dropped_queue_full = 0
+        self.dropped_under_load = 0
+        self.errors = 0
+        # Primary model_used -> comparison counters
+        self.by_primary: Dict[str, _Comparison] = defaultdict(_Comparison)
+        self.recent_disagreements: deque = deque(maxlen=20)
+
+    @property
+    def enabled(self) -> bool:
+        return self.model_path is not None and self.sample_rate > 0
+
+    # ==================== Request path ====================
+
+    def submit(self, input_data: Dict[str, Any], primary: Dict[str, Any], primary_seconds: float):
+        """
+        Maybe copy a served request to the shadow worker (never blocks)
+
+        Args:
+            input_data: Feature values the primary model was given
+            primary: The primary prediction result
+            primary_seconds: Wall time of the primary model call
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return
+        self.sampled += 1
+
+        lane = admission_controller.lanes.get("predict")
+        if settings.ADMISSION_ENABLED and lane is not None and lane.saturated:
+            self.dropped_under_load += 1
+            return
+
+        try:
+            self._ensure_worker().put_nowait((input_data, primary, primary_seconds))
+        except queue.Full:
+            self.dropped_queue_full += 1
+
+    def _ensure_worker(self) -> queue.Queue:
+        # Threads do not survive fork: each preforked worker starts its own
+        if self._worker is None or self._pid != os.getpid() or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or self._pid != os.getpid() or not self._worker.is_alive():
+                    self._queue = queue.Queue(maxsize=self.queue_size)
+                    self._pid = os.getpid()
+                    self._worker = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+                    self._worker.start()
+        return self._queue
+
+    # ==================== Worker ====================
+
+    def _load(self) -> bool:
+        if self.model is not None:
+            return True
+        if self.load_error is not None:
+            return False
+        try:
+            import joblib
+
+            self.model = joblib.load(self.model_path)
+            print(f"✓ Shadow model loaded: {self.model_path}")
+            return True
+        except Exception as e:
+            self.load_error = str(e)
+            print(f"⚠️  Warning: Shadow model not loaded: {e}")
+            return False
+
+    def _run(self):
+        jobs = self._queue
+        while True:
+            input_data, primary, primary_seconds = jobs.get()
+            if not self._load():
+                self.errors += 1
+                continue
+            try:
+                self._evaluate(input_data, primary, primary_seconds)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️  Shadow evaluation failed: {e}")
+
+    def _evaluate(self, input_data: Dict[str, Any], primary: Dict[str, Any], primary_seconds: float):
+        start = time.perf_counter()
+        X = model_manager.prepare_features(input_data, observe=False)
+        probability = float(self.model.predict_proba(X)[0][1])
+        shadow_seconds = time.perf_counter() - start
+
+        predicted = int(probability >= 0.5)
+        diff = abs(probability - primary["probability_confirmed"])
+
+        with self._lock:
+            comparison = self.by_primary[primary["model_used"]]
+            comparison.evaluated += 1
+            comparison.abs_probability_diff += diff
+            comparison.primary_latency.add(primary_seconds * 1000)
+            comparison.shadow_latency.add(shadow_seconds * 1000)
+            if predicted != primary["predicted_class"]:
+                comparison.disagreements += 1
+                self.recent_disagreements.append({
+                    "model_used": primary["model_used"],
+                    "primary_probability_confirmed": primary["probability_confirmed"],
+                    "shadow_probability_confirmed": probability,
+                    "input": input_data,
+                })
+
+    # ==================== Reporting ====================
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            evaluated = sum(comparison.evaluated for comparison in self.by_primary.values())
+            disagreements = sum(comparison.disagreements for comparison in self.by_primary.values())
+            return {
+                "worker_pid": os.getpid(),
+                "enabled": self.enabled,
+                "model_path": str(self.model_path) if self.model_path else None,
+                "model_loaded": self.model is not None,
+                "load_error": self.load_error,
+                "sample_rate": self.sample_rate,
+                "queue_size": self.queue_size,
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "sampled": self.sampled,
+                "dropped_queue_full": self.dropped_queue_full,
+                "dropped_under_load": self.dropped_under_load,
+                "evaluated": evaluated,
+                "errors": self.errors,
+                "disagreements": disagreements,
+                "by_primary_model": {
+                    model: comparison.summary() for model, comparison in sorted(self.by_primary.items())
+                },
+                "recent_disagreements": list(self.recent_disagreements),
+            }
+
+
+# Create global shadow evaluator instance
+shadow_evaluator = ShadowEvaluator()
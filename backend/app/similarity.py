@@ -0,0 +1,198 @@
+"""
+Similar Candidates Index
+Nearest-neighbour lookup of catalog KOIs over standardized model features
+"""
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .config import settings
+from .datasets import CATALOG_DATASETS, DatasetRegistry, dataset_registry, index_memory
+from .models import model_manager
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+# Catalog columns returned with each neighbour (when present in the dataset)
+RESULT_COLUMNS = [
+    "kepoi_name",
+    "kepid",
+    "kepler_name",
+    "koi_disposition",
+    "koi_pdisposition",
+    "koi_period",
+    "koi_prad",
+]
+
+class _IndexState:
+    """Immutable snapshot of a built index, swapped in atomically on rebuild"""
+
+    def __init__(self, dataset: str, version: str, tree: Any, center: "np.ndarray",
+                 scale: "np.ndarray", fill: "np.ndarray", rows: List[Dict[str, Any]], build_seconds: float):
+        self.dataset = dataset
+        self.version = version
+        self.tree = tree
+        self.center = center
+        self.scale = scale
+        self.fill = fill
+        self.rows = rows
+        self.build_seconds = build_seconds
+        self.resident_bytes = index_memory(tree, rows, center, scale, fill)
+
+
+class SimilarityIndex:
+    """Ball-tree index over a catalog dataset, rebuilt when its version changes"""
+
+    def __init__(self, registry: DatasetRegistry, dataset: Optional[str] = None):
+        self.registry = registry
+        self._dataset = dataset
+        self._state: Optional[_IndexState] = None
+        self._build_lock = threading.Lock()
+        self.builds = 0
+        self.queries = 0
+
+    @property
+    def dataset(self) -> Optional[str]:
+        """Configured catalog, or the first default catalog that exists"""
+        return self.registry.catalog(self._dataset)
+
+    @property
+    def features(self) -> List[str]:
+        if model_manager.features is not None:
+            return model_manager.features
+        with open(settings.FEATURES_PATH, 'r') as f:
+            return json.load(f)['features']
+
+    # ==================== Building ====================
+
+    def on_dataset_loaded(self, name: str, frame: "pd.DataFrame", version: str):
+        """Registry listener: (re)build whenever the catalog dataset loads"""
+        if name == self.dataset:
+            self._build(name, frame, version)
+
+    def on_dataset_unloaded(self, name: str):
+        """Registry listener: drop the index with its evicted dataset"""
+        state = self._state
+        if state is not None and state.dataset == name:
+            self._state = None
+
+    def index_bytes(self, name: str) -> int:
+        state = self._state
+        return state.resident_bytes if state is not None and state.dataset == name else 0
+
+    def _build(self, name: str, frame: "pd.DataFrame", version: str):
+        import numpy as np
+        import pandas as pd
+        from sklearn.neighbors import BallTree
+
+        with self._build_lock:
+            if self._state is not None and self._state.dataset == name and self._state.version == version:
+                return
+
+            start = time.perf_counter()
+            features = self.features
+            X = frame.reindex(columns=features).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+            # Median imputation (as in training), then z-score standardization
+            fill = np.nanmedian(X, axis=0)
+            fill = np.where(np.isnan(fill), 0.0, fill)
+            X = np.where(np.isnan(X), fill, X)
+            center = X.mean(axis=0)
+            scale = X.std(axis=0)
+            scale[scale == 0] = 1.0
+            X = (X - center) / scale
+
+            tree = BallTree(X, leaf_size=settings.SIMILARITY_LEAF_SIZE)
+
+            columns = [col for col in RESULT_COLUMNS if col in frame.columns]
+            rows = json.loads(frame[columns].to_json(orient='records'))
+
+            self._state = _IndexState(
+                dataset=name,
+                version=version,
+                tree=tree,
+                center=center,
+                scale=scale,
+                fill=fill,
+                rows=rows,
+                build_seconds=time.perf_counter() - start,
+            )
+            self.builds += 1
+            print(f"✓ Similarity index built: {name} ({len(rows):,} rows, {self._state.build_seconds:.2f}s)")
+
+    def ensure(self) -> _IndexState:
+        """
+        Return a current index, building it if needed
+        Touching the dataset through the registry reloads it when the file
+        changed, which fires on_dataset_loaded and rebuilds the index.
+        """
+        name = self.dataset
+        if name is None:
+            raise ValueError(f"No catalog dataset for similarity search (looked for {', '.join(CATALOG_DATASETS)})")
+        frame = self.registry.get(name)
+        state = self._state
+        if state is None or state.dataset != name or state.version != self.registry.entries[name].version:
+            self._build(name, frame, self.registry.entries[name].version)
+            state = self._state
+        return state
+
+    # ==================== Querying ====================
+
+    def query(self, inputs: List[Dict[str, Any]], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Find the k nearest catalog rows for each input
+
+        Args:
+            inputs: Feature dictionaries (missing features use catalog medians)
+            k: Neighbours per input
+
+        Returns:
+            One list of neighbours per input, nearest first
+        """
+        import numpy as np
+
+        state = self.ensure()
+        features = self.features
+        k = max(1, min(k, len(state.rows)))
+
+        X = np.array(
+            [[row.get(feature, np.nan) for feature in features] for row in inputs],
+            dtype=np.float64,
+        )
+        X = np.where(np.isnan(X), state.fill, X)
+        X = (X - state.center) / state.scale
+
+        distances, indices = state.tree.query(X, k=k)
+        self.queries += len(inputs)
+
+        return [
+            [
+                {**state.rows[idx], "distance": float(dist)}
+                for dist, idx in zip(row_distances, row_indices)
+            ]
+            for row_distances, row_indices in zip(distances, indices)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        state = self._state
+        return {
+            "dataset": state.dataset if state else self.dataset,
+            "version": state.version if state else None,
+            "rows": len(state.rows) if state else 0,
+            "build_seconds": round(state.build_seconds, 4) if state else None,
+            "resident_bytes": state.resident_bytes if state else 0,
+            "builds": self.builds,
+            "queries": self.queries,
+        }
+
+
+# Create global similarity index instance
+similarity_index = SimilarityIndex(dataset_registry, settings.SIMILARITY_DATASET)
+dataset_registry.add_listener(
+    similarity_index.on_dataset_loaded,
+    on_unload=similarity_index.on_dataset_unloaded,
+    index_bytes=similarity_index.index_bytes,
+)
@@ -0,0 +1,70 @@
+"""
+Startup Timing
+Cold-start breakdown: interpreter start, imports, model and dataset loads
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from . import IMPORT_STARTED
+
+
+def _process_age() -> Optional[float]:
+    """Seconds since this process started (Linux only)"""
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # Field 22 is the start time in clock ticks after boot; skip past the
+            # command name, which may itself contain spaces
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupReport:
+    """Named startup phases and their durations in seconds"""
+
+    def __init__(self):
+        age = _process_age()
+        # Interpreter start-up until backend.app was first imported
+        self.process_offset = (age - (time.perf_counter() - IMPORT_STARTED)) if age is not None else None
+        self.phases: Dict[str, float] = {}
+        self.ready_seconds: Optional[float] = None
+
+    def record(self, name: str, seconds: float, overwrite: bool = False):
+        if overwrite or name not in self.phases:
+            self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def since_import(self) -> float:
+        return time.perf_counter() - IMPORT_STARTED
+
+    def mark_ready(self):
+        """Call once the app can serve requests"""
+        if self.ready_seconds is None:
+            self.ready_seconds = self.since_import()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "interpreter_seconds": round(self.process_offset, 4) if self.process_offset is not None else None,
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "ready_after_import_seconds": round(self.ready_seconds, 4) if self.ready_seconds is not None else None,
+        }
+
+    def format(self) -> str:
+        parts = [f"{name} {seconds:.2f}s" for name, seconds in self.phases.items()]
+        return ", ".join(parts) or "no phases recorded"
+
+
+# Create global startup report instance
+startup_report = StartupReport()
@@ -0,0 +1,112 @@
+"""
+What-If Sweeps
+Expands a base candidate and one or two feature grids into a single batch
+
+The demo page moves sliders for koi_period, koi_prad, ...; rather than one
+/predict call per slider position, the whole grid is built as one feature
+matrix (base values broadcast, swept features laid out with meshgrid) and
+scored with a single predict_proba call.
+"""
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .schemas import SweepAxis
+
+
+def axis_values(axis: "SweepAxis") -> "np.ndarray":
+    """Explicit values, or num points from start to stop (geometric if log)"""
+    import numpy as np
+
+    if axis.values is not None:
+        values = np.asarray(axis.values, dtype=np.float64)
+        if values.size == 0:
+            raise ValueError(f"Sweep axis '{axis.feature}' has no values")
+        return values
+    if axis.start is None or axis.stop is None:
+        raise ValueError(f"Sweep axis '{axis.feature}' needs either values or start and stop")
+    if axis.log:
+        if axis.start <= 0 or axis.stop <= 0:
+            raise ValueError(f"Log sweep of '{axis.feature}' needs positive start and stop")
+        return np.geomspace(axis.start, axis.stop, axis.num)
+    return np.linspace(axis.start, axis.stop, axis.num)
+
+
+def build_grid(
+    base: Dict[str, Any],
+    axes: List["SweepAxis"],
+    features: List[str],
+) -> Tuple[Dict[str, "np.ndarray"], Dict[str, "np.ndarray"], Tuple[int, ...]]:
+    """
+    Lay out a sweep as feature columns
+
+    Args:
+        base: Feature values of the base candidate (None values dropped)
+        axes: One or two swept features with their grids
+        features: Model feature names (swept features must be among them)
+
+    Returns:
+        (columns for validate_columns, per-axis grid values, grid shape)
+    """
+    import numpy as np
+
+    names = [axis.feature for axis in axes]
+    unknown = [name for name in names if name not in features]
+    if unknown:
+        raise ValueError(f"Cannot sweep non-model feature(s): {', '.join(unknown)}")
+    if len(set(names)) != len(names):
+        raise ValueError("Sweep axes must use different features")
+
+    grids = {axis.feature: axis_values(axis) for axis in axes}
+    shape = tuple(len(values) for values in grids.values())
+    n_points = int(np.prod(shape))
+    if n_points > settings.SWEEP_MAX_POINTS:
+        raise ValueError(f"Sweep has {n_points} points, maximum is {settings.SWEEP_MAX_POINTS}")
+
+    columns = {name: np.full(n_points, value, dtype=np.float64) for name, value in base.items()}
+    # indexing='ij': row i of the surface is the i-th value of the first axis
+    for name, mesh in zip(grids, np.meshgrid(*grids.values(), indexing='ij')):
+        columns[name] = mesh.ravel()
+    return columns, grids, shape
+
+
+def run_sweep(
+    base: Dict[str, Any],
+    axes: List["SweepAxis"],
+    model_type: str,
+    budget_ms: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Score a sweep grid with one model call
+
+    Grid values are validated against PredictionInput constraints like a
+    /predict/batch body. The sweep counts once towards input monitoring
+    (its base values), not once per synthetic grid point. model_type "auto"
+    picks a model for the grid size within budget_ms.
+    """
+    from .batch import validate_columns
+    from .models import model_manager
+    from .monitoring import feature_monitor
+    from .model_selection import model_selector
+
+    columns, grids, shape = build_grid(base, axes, model_manager.features)
+    features = validate_columns(columns, model_manager.features, settings.SWEEP_MAX_POINTS)
+    if model_type == "auto":
+        model_type, _ = model_selector.choose(budget_ms, rows=len(features))
+
+    feature_monitor.observe(base, model_manager.feature_set)
+    start = time.perf_counter()
+    # Full-forest probabilities: early exit would use a different tree count per grid point
+    result = model_manager.predict_batch(features, model_type=model_type, observe=False, early_exit=False)
+    model_selector.record(model_type, time.perf_counter() - start, rows=len(features))
+
+    return {
+        "model_used": result["model_used"],
+        "features": list(grids),
+        "grid": {name: values.tolist() for name, values in grids.items()},
+        "shape": list(shape),
+        "probability_confirmed": result["columns"]["probability_confirmed"].reshape(shape).tolist(),
+    }
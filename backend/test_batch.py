@@ -0,0 +1,91 @@
+"""
+Tests for columnar batch validation
+"""
+import numpy as np
+import pytest
+
+from backend.app.batch import BatchValidationError, validate_columns
+
+
+FEATURES = ["koi_period", "koi_duration", "koi_depth", "koi_prad", "koi_steff", "koi_fpflag_nt"]
+
+
+def valid_columns(n=3):
+    return {
+        "koi_period": [1.5 + i for i in range(n)],
+        "koi_duration": [2.0] * n,
+        "koi_depth": [500.0] * n,
+        "koi_prad": [1.1] * n,
+    }
+
+
+def errors_for(columns, max_rows=100):
+    with pytest.raises(BatchValidationError) as raised:
+        validate_columns(columns, FEATURES, max_rows)
+    return raised.value.errors
+
+
+def test_valid_batch_becomes_float_frame():
+    columns = valid_columns()
+    columns["koi_steff"] = [5700, None, 5800]
+    columns["koi_fpflag_nt"] = [0, 1, 0]
+    columns["unrelated"] = ["ignored"] * 3
+
+    frame = validate_columns(columns, FEATURES, max_rows=100)
+
+    assert len(frame) == 3
+    assert "unrelated" not in frame.columns
+    assert frame.dtypes.map(lambda dtype: dtype == np.float64).all()
+    assert np.isnan(frame["koi_steff"][1])
+
+
+def test_missing_required_column():
+    columns = valid_columns()
+    del columns["koi_depth"]
+
+    assert {"column": "koi_depth", "error": "column is required"} in errors_for(columns)
+
+
+def test_missing_required_value_reports_rows():
+    columns = valid_columns()
+    columns["koi_prad"][1] = None
+
+    assert {"column": "koi_prad", "error": "value is required", "rows": [1]} in errors_for(columns)
+
+
+def test_out_of_range_values_report_rows():
+    columns = valid_columns(4)
+    columns["koi_period"][0] = 0.0
+    columns["koi_period"][3] = -2.0
+
+    errors = errors_for(columns)
+
+    assert {"column": "koi_period", "error": "must be greater than 0", "rows": [0, 3]} in errors
+
+
+def test_non_integer_flags():
+    columns = valid_columns()
+    columns["koi_fpflag_nt"] = [0, 0.5, 1]
+
+    assert {"column": "koi_fpflag_nt", "error": "values must be integers", "rows": [1]} in errors_for(columns)
+
+
+def test_non_numeric_values():
+    columns = valid_columns()
+    columns["koi_steff"] = [5700, "hot", 5800]
+
+    assert {"column": "koi_steff", "error": "values must be numeric", "rows": [1]} in errors_for(columns)
+
+
+def test_row_cap():
+    errors = errors_for(valid_columns(11), max_rows=10)
+
+    assert errors == [{"column": None, "error": "batch has 11 rows, maximum is 10"}]
+    assert len(validate_columns(valid_columns(10), FEATURES, max_rows=10)) == 10
+
+
+def test_columns_of_different_lengths():
+    columns = valid_columns()
+    columns["koi_prad"] = [1.0]
+
+    assert "different lengths" in errors_for(columns)[0]["error"]
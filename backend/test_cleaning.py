@@ -0,0 +1,94 @@
+"""
+Tests for the incremental cleaning pipeline
+"""
+import os
+
+import pandas as pd
+
+from backend.app.cleaning import IncrementalCleaner, load_clean
+
+
+HEADER = "# NASA Exoplanet Archive export\nkepoi_name,koi_disposition,koi_period\n"
+
+
+def write_raw(path, rows):
+    path.write_text(HEADER + "".join(f"{name},{disposition},{period}\n" for name, disposition, period in rows))
+    # Distinct fingerprint even when rewritten within the filesystem's timestamp resolution
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def make_cleaner(tmp_path, rows):
+    raw = tmp_path / "kepler.csv"
+    write_raw(raw, rows)
+    cleaner = IncrementalCleaner("kepler", raw_path=raw, key="kepoi_name", clean_dir=tmp_path / "clean", chunk_size=2)
+    return cleaner, raw
+
+
+ROWS = [
+    ("K00001.01", "CONFIRMED", "1.5"),
+    ("K00002.01", "FALSE POSITIVE", "2.5"),
+    ("K00003.01", "CANDIDATE", "3.5"),
+]
+
+
+def test_new_rows_are_appended(tmp_path):
+    cleaner, raw = make_cleaner(tmp_path, ROWS)
+    assert cleaner.run()["mode"] == "full"
+
+    write_raw(raw, ROWS + [("K00004.01", "CONFIRMED", "4.5"), ("K00005.01", "CANDIDATE", "5.5")])
+    summary = cleaner.run()
+
+    assert summary["mode"] == "incremental"
+    assert summary["rows_scanned"] == 5
+    assert summary["rows_appended"] == 2
+    clean = pd.read_csv(cleaner.clean_path)
+    assert clean["kepoi_name"].tolist() == [name for name, _, _ in ROWS] + ["K00004.01", "K00005.01"]
+
+
+def test_rerun_on_unchanged_input_adds_nothing(tmp_path):
+    cleaner, raw = make_cleaner(tmp_path, ROWS)
+    cleaner.run()
+    before = cleaner.clean_path.read_bytes()
+
+    # Same file: skipped without scanning
+    assert cleaner.run()["mode"] == "unchanged"
+
+    # Rewritten with identical content: scanned, nothing appended
+    write_raw(raw, ROWS)
+    summary = cleaner.run()
+
+    assert summary["mode"] == "incremental"
+    assert summary["rows_appended"] == 0
+    assert cleaner.clean_path.read_bytes() == before
+    assert load_clean("kepler", clean_dir=cleaner.clean_dir)["kepoi_name"].is_unique
+
+
+def test_superseded_keys_are_deduped_on_load(tmp_path):
+    cleaner, raw = make_cleaner(tmp_path, ROWS)
+    cleaner.run()
+
+    # K00003.01 is dispositioned in the next release
+    write_raw(raw, ROWS[:2] + [("K00003.01", "CONFIRMED", "3.5")])
+    assert cleaner.run()["rows_appended"] == 1
+    assert len(pd.read_csv(cleaner.clean_path)) == 4  # the superseded row is still in the file
+
+    clean = load_clean("kepler", clean_dir=cleaner.clean_dir)
+
+    assert len(clean) == 3
+    assert clean["kepoi_name"].is_unique
+    assert clean.set_index("kepoi_name").loc["K00003.01", "koi_disposition"] == "CONFIRMED"
+
+    # Compaction drops the superseded row from the file itself
+    assert cleaner.compact() == 3
+    assert len(pd.read_csv(cleaner.clean_path)) == 3
+
+
+def test_duplicate_keys_within_a_release_keep_the_last(tmp_path):
+    cleaner, _ = make_cleaner(tmp_path, ROWS + [("K00001.01", "FALSE POSITIVE", "1.5")])
+    cleaner.run()
+
+    clean = load_clean("kepler", clean_dir=cleaner.clean_dir)
+
+    assert len(clean) == 3
+    assert clean.set_index("kepoi_name").loc["K00001.01", "koi_disposition"] == "FALSE POSITIVE"
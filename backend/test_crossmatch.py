@@ -0,0 +1,72 @@
+"""
+Tests for chord-distance angular separations
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.app.crossmatch import SkyIndex, chord_length, separation_arcsec, unit_vectors
+from backend.app.datasets import DatasetRegistry
+
+
+def haversine_arcsec(ra1, dec1, ra2, dec2):
+    """Reference great-circle separation in arcseconds"""
+    ra1, dec1, ra2, dec2 = map(math.radians, (ra1, dec1, ra2, dec2))
+    h = math.sin((dec2 - dec1) / 2) ** 2 + math.cos(dec1) * math.cos(dec2) * math.sin((ra2 - ra1) / 2) ** 2
+    return math.degrees(2 * math.asin(min(1.0, math.sqrt(h)))) * 3600
+
+
+def chord_separation(ra1, dec1, ra2, dec2):
+    xyz = unit_vectors(np.array([ra1, ra2], dtype=float), np.array([dec1, dec2], dtype=float))
+    return float(separation_arcsec(np.array([np.linalg.norm(xyz[0] - xyz[1])]))[0])
+
+
+PAIRS = [
+    # (ra1, dec1, ra2, dec2)
+    (290.0, 44.5, 290.001, 44.5),        # Kepler field, ~2.6 arcsec
+    (359.9995, 10.0, 0.0005, 10.0),      # across RA = 0/360
+    (0.0, -30.0, 359.0, -30.0),          # across RA = 0/360, ~52 arcmin
+    (45.0, 89.9999, 225.0, 89.9999),     # over the north pole, 0.72 arcsec
+    (10.0, 89.99, 100.0, 89.99),         # near the pole, large RA difference
+    (120.0, -89.9995, 300.0, -89.9998),  # over the south pole
+    (0.0, 0.0, 180.0, 0.0),              # antipodal
+    (10.0, 20.0, 10.0, 20.0),            # identical
+]
+
+
+@pytest.mark.parametrize("ra1, dec1, ra2, dec2", PAIRS)
+def test_separation_matches_haversine(ra1, dec1, ra2, dec2):
+    expected = haversine_arcsec(ra1, dec1, ra2, dec2)
+
+    # Well under a milliarcsecond at small separations; relative error for large ones
+    assert chord_separation(ra1, dec1, ra2, dec2) == pytest.approx(expected, rel=1e-9, abs=1e-4)
+
+
+@pytest.mark.parametrize("radius_arcsec", [0.1, 1.0, 5.0, 60.0, 3600.0])
+def test_chord_length_round_trips(radius_arcsec):
+    assert separation_arcsec(np.array([chord_length(radius_arcsec)]))[0] == pytest.approx(radius_arcsec, rel=1e-9)
+
+
+def test_cone_search_across_ra_wrap_and_pole(tmp_path):
+    data_dir = tmp_path / "data" / "sample"
+    data_dir.mkdir(parents=True)
+    pd.DataFrame({
+        "kepoi_name": ["wrap_west", "wrap_east", "far", "pole_a", "pole_b", "no_position"],
+        "ra": [359.9995, 0.0005, 1.0, 0.0, 180.0, None],
+        "dec": [0.0, 0.0, 0.0, 89.9999, 89.9999, 0.0],
+    }).to_csv(data_dir / "positions.csv", index=False)
+    registry = DatasetRegistry(tmp_path / "data")
+    registry.discover()
+    index = SkyIndex(registry)
+
+    wrap = index.cone_search("positions", ra=0.0, dec=0.0, radius_arcsec=2.0)
+    assert sorted(match["kepoi_name"] for match in wrap["matches"]) == ["wrap_east", "wrap_west"]
+    for match in wrap["matches"]:
+        assert match["separation_arcsec"] == pytest.approx(haversine_arcsec(0.0, 0.0, match["ra"], match["dec"]), abs=1e-4)
+
+    # The two pole points are 0.72 arcsec apart despite 180 degrees of RA
+    pole = index.cone_search("positions", ra=90.0, dec=90.0, radius_arcsec=0.5)
+    assert sorted(match["kepoi_name"] for match in pole["matches"]) == ["pole_a", "pole_b"]
+    assert index.stats()["indexes"]["positions"]["skipped_rows"] == 1
@@ -0,0 +1,72 @@
+"""
+Tests for dataset registry listeners and memory accounting
+"""
+import threading
+
+import pandas as pd
+
+from backend.app.datasets import DatasetRegistry
+
+
+def write_datasets(tmp_path, *names, rows=1000):
+    data_dir = tmp_path / "data" / "sample"
+    data_dir.mkdir(parents=True)
+    for name in names:
+        pd.DataFrame({"kepoi_name": [f"K{i:05d}.01" for i in range(rows)], "ra": range(rows)}).to_csv(
+            data_dir / f"{name}.csv", index=False
+        )
+    registry = DatasetRegistry(tmp_path / "data", memory_budget_bytes=10**9)
+    registry.discover()
+    return registry
+
+
+def test_listeners_run_without_holding_the_registry_lock(tmp_path):
+    registry = write_datasets(tmp_path, "slow", "other")
+    building = threading.Event()
+    release = threading.Event()
+
+    def slow_index(name, frame, version):
+        if name == "slow":
+            building.set()
+            release.wait(5)
+
+    registry.add_listener(slow_index)
+    loader = threading.Thread(target=registry.get, args=("slow",))
+    loader.start()
+    assert building.wait(5)
+
+    # Another dataset loads while the slow index is still building
+    other = {}
+    reader = threading.Thread(target=lambda: other.update(frame=registry.get("other")))
+    reader.start()
+    reader.join(2)
+    finished_while_building = not reader.is_alive()
+    release.set()
+    loader.join(5)
+    reader.join(5)
+
+    assert finished_while_building
+    assert len(other["frame"]) == 1000
+
+
+def test_index_memory_counts_against_budget_and_is_freed_on_eviction(tmp_path):
+    registry = write_datasets(tmp_path, "first", "second")
+    indexes = {}
+    registry.add_listener(
+        lambda name, frame, version: indexes.__setitem__(name, 10**6),
+        on_unload=lambda name: indexes.pop(name, None),
+        index_bytes=lambda name: indexes.get(name, 0),
+    )
+
+    registry.get("first")
+    frame_bytes = registry.entries["first"].resident_bytes
+    assert registry.resident_bytes() == frame_bytes + 10**6
+
+    # Room for one dataset with its index, not two
+    registry.memory_budget_bytes = frame_bytes + 10**6 + frame_bytes
+    registry.get("second")
+
+    assert not registry.entries["first"].loaded
+    assert "first" not in indexes
+    assert registry.evictions == 1
+    assert registry.resident_bytes() == registry.entries["second"].resident_bytes + 10**6
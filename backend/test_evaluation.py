@@ -0,0 +1,72 @@
+"""
+Tests for single-sort evaluation metrics
+"""
+import numpy as np
+import pytest
+from sklearn.calibration import calibration_curve
+from sklearn.metrics import average_precision_score, brier_score_loss, confusion_matrix, f1_score, roc_auc_score
+
+from backend.app.evaluation import calibration, threshold_metrics
+
+
+@pytest.fixture
+def scored():
+    rng = np.random.default_rng(7)
+    labels = rng.integers(0, 2, 2000)
+    # Overlapping classes with many tied scores
+    scores = np.clip(rng.normal(0.35 + 0.3 * labels, 0.2), 0, 1).round(2)
+    return labels, scores
+
+
+def test_areas_match_sklearn(scored):
+    labels, scores = scored
+    metrics = threshold_metrics(labels, scores)
+
+    assert metrics["roc_auc"] == pytest.approx(roc_auc_score(labels, scores))
+    assert metrics["pr_auc"] == pytest.approx(average_precision_score(labels, scores))
+
+
+def test_confusion_and_f1_at_thresholds_match_sklearn(scored):
+    labels, scores = scored
+    metrics = threshold_metrics(labels, scores)
+
+    for key in ("default_threshold", "best_f1_threshold", "youden_threshold"):
+        point = metrics[key]
+        predicted = (scores >= point["threshold"]).astype(int)
+        assert point["confusion_matrix"] == confusion_matrix(labels, predicted).tolist()
+        assert point["f1_score"] == pytest.approx(f1_score(labels, predicted))
+
+    # Best F1 over every distinct threshold
+    best = max(f1_score(labels, (scores >= t).astype(int)) for t in np.unique(scores))
+    assert metrics["best_f1_threshold"]["f1_score"] == pytest.approx(best)
+
+
+def test_threshold_table_counts(scored):
+    labels, scores = scored
+    table = threshold_metrics(labels, scores, curve_points=10_000)["curves"]["thresholds"]
+
+    for threshold, tp, fp in zip(table["threshold"], table["tp"], table["fp"]):
+        predicted = scores >= threshold
+        assert tp == int((predicted & (labels == 1)).sum())
+        assert fp == int((predicted & (labels == 0)).sum())
+
+
+def test_single_class_is_rejected():
+    with pytest.raises(ValueError):
+        threshold_metrics(np.ones(10, dtype=int), np.linspace(0, 1, 10))
+
+
+def test_calibration_matches_sklearn():
+    rng = np.random.default_rng(11)
+    # Continuous scores, so none sits exactly on a bin edge (where binning conventions differ)
+    scores = rng.random(5000)
+    labels = (rng.random(5000) < scores ** 1.5).astype(int)
+
+    result = calibration(labels, scores, n_bins=10)
+    fraction, mean_predicted = calibration_curve(labels, scores, n_bins=10, strategy="uniform")
+    filled = [b for b in result["bins"] if b["count"]]
+
+    assert result["brier_score"] == pytest.approx(brier_score_loss(labels, scores))
+    assert [b["fraction_confirmed"] for b in filled] == pytest.approx(fraction.tolist())
+    assert [b["mean_predicted"] for b in filled] == pytest.approx(mean_predicted.tolist())
+    assert sum(b["count"] for b in result["bins"]) == len(scores)
@@ -0,0 +1,29 @@
+"""
+Tests for chunked dataset export
+"""
+import json
+
+import pandas as pd
+
+from backend.app.config import settings
+from backend.app.datasets import DatasetEntry
+from backend.app.export import export_stream
+
+
+def test_ndjson_multi_chunk_export_has_no_blank_lines(tmp_path, monkeypatch):
+    """Every line of an NDJSON export spanning several chunks is one JSON record"""
+    path = tmp_path / "koi.csv"
+    pd.DataFrame({
+        "kepoi_name": [f"K{i:05d}.01" for i in range(500)],
+        "koi_period": [1.5 + i for i in range(500)],
+    }).to_csv(path, index=False)
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 100)
+
+    stream, _ = export_stream(DatasetEntry("koi", path, "sample"), "ndjson")
+    lines = b"".join(stream).decode().split("\n")
+
+    assert lines[-1] == ""  # file ends with a newline
+    records = [json.loads(line) for line in lines[:-1]]
+    assert len(records) == 500
+    assert records[0]["kepoi_name"] == "K00000.01"
+    assert records[-1]["koi_period"] == 500.5
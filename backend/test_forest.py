@@ -0,0 +1,61 @@
+"""
+Tests for early-exit RandomForest inference
+"""
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from backend.app.forest import early_exit_proba
+
+
+@pytest.fixture(scope="module")
+def forest_and_rows():
+    # Label noise and overlapping classes leave plenty of rows near 0.5
+    X, y = make_classification(
+        n_samples=4000, n_features=12, n_informative=6, flip_y=0.15, class_sep=0.6, random_state=3
+    )
+    forest = RandomForestClassifier(n_estimators=300, min_samples_leaf=3, random_state=3, n_jobs=1)
+    forest.fit(X[:3000], y[:3000])
+    return forest, X[3000:]
+
+
+def classes(probability):
+    # ModelManager takes argmax over [1 - p, p]: a tie goes to class 0, as in forest.predict
+    return (probability > 0.5).astype(int)
+
+
+def test_early_exit_matches_full_forest_classes(forest_and_rows):
+    forest, X = forest_and_rows
+    full = forest.predict_proba(X)[:, 1]
+
+    early, used = early_exit_proba(forest, X, batch_size=25, tolerance=0.001)
+
+    assert np.array_equal(classes(early), forest.predict(X))
+    assert np.array_equal(classes(early), classes(full))
+    # Confident rows stop early; the saving is the point of the feature
+    assert used.min() == 25
+    assert used.mean() < 300
+
+
+def test_rows_near_the_decision_boundary(forest_and_rows):
+    forest, X = forest_and_rows
+    full = forest.predict_proba(X)[:, 1]
+    near = np.abs(full - 0.5) < 0.05
+    assert near.sum() >= 20
+
+    early, used = early_exit_proba(forest, X, batch_size=25, tolerance=0.001)
+
+    assert np.array_equal(classes(early[near]), classes(full[near]))
+    # Too close to call after a partial vote: these rows see (nearly) the whole forest
+    assert used[near].min() >= 200
+    assert used[near].mean() > used[~near].mean()
+
+
+def test_zero_tolerance_is_the_full_forest(forest_and_rows):
+    forest, X = forest_and_rows
+
+    early, used = early_exit_proba(forest, X, batch_size=40, tolerance=0.0)
+
+    assert (used == 300).all()
+    assert np.allclose(early, forest.predict_proba(X)[:, 1])
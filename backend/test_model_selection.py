@@ -0,0 +1,107 @@
+"""
+Tests for latency-budget model selection and probing
+"""
+import pytest
+
+from backend.app import model_selection
+from backend.app.config import settings
+from backend.app.model_selection import PROBE_TIMEOUT_SECONDS, ModelSelector
+
+
+@pytest.fixture
+def selector(monkeypatch):
+    # LightGBM ranks first by held-out accuracy
+    monkeypatch.setattr(model_selection.model_manager, "metadata", {
+        "models": {
+            "lightgbm": {"metrics": {"pr_auc": 0.99}},
+            "random_forest": {"metrics": {"pr_auc": 0.90}},
+        }
+    })
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", False)
+    monkeypatch.setattr(settings, "AUTO_MIN_SAMPLES", 5)
+    return ModelSelector(window_seconds=60)
+
+
+def measure(selector, model, seconds, samples=5, rows=1):
+    for _ in range(samples):
+        selector.record(model, seconds * rows, rows=rows)
+
+
+def test_one_probe_in_flight_per_unmeasured_model(selector):
+    measure(selector, "rf", 0.002)
+
+    choices = [selector.choose(100)[0] for _ in range(10)]
+
+    # The first request probes LightGBM; the rest stay on the measured model meanwhile
+    assert choices == ["lgbm"] + ["rf"] * 9
+    assert selector.probes == 1
+    assert selector.stats()["probes_in_flight"] == 1
+
+
+def test_first_requests_probe_each_model_once(selector):
+    choices = [selector.choose(100)[0] for _ in range(5)]
+
+    assert choices[:2] == ["lgbm", "rf"]
+    assert selector.probes == 2
+    assert set(choices[2:]) == {"lgbm"}  # nothing measured yet: best-ranked model
+
+
+def test_probe_is_cleared_when_it_records(selector):
+    measure(selector, "rf", 0.002)
+    assert selector.choose(100)[0] == "lgbm"
+    assert selector.choose(100)[0] == "rf"
+
+    selector.record("lgbm", 0.003)
+
+    assert selector.stats()["probes_in_flight"] == 0
+    # Still too few samples: the next request may probe again
+    assert selector.choose(100)[0] == "lgbm"
+    assert selector.probes == 2
+
+
+def test_stale_probe_is_retried_after_timeout(selector, monkeypatch):
+    measure(selector, "rf", 0.002)
+    assert selector.choose(100)[0] == "lgbm"
+
+    now = model_selection.time.monotonic()
+    monkeypatch.setattr(model_selection.time, "monotonic", lambda: now + PROBE_TIMEOUT_SECONDS + 1)
+
+    assert selector.choose(100)[0] == "lgbm"
+    assert selector.probes == 2
+
+
+def test_budget_selection_once_measured(selector):
+    measure(selector, "lgbm", 0.010)
+    measure(selector, "rf", 0.002)
+
+    model, details = selector.choose(50)
+    assert model == "lgbm"
+    assert details["reason"] == "most accurate within budget"
+
+    model, details = selector.choose(5)
+    assert model == "rf"
+    assert details["reason"] == "lgbm expected over budget"
+
+    model, details = selector.choose(1)
+    assert model == "rf"  # nothing fits: the fastest
+    assert selector.over_budget == 1
+    assert selector.probes == 0
+
+
+def test_waiting_time_comes_out_of_the_budget(selector):
+    measure(selector, "lgbm", 0.010)
+    measure(selector, "rf", 0.002)
+
+    assert selector.choose(50, waited_ms=45)[0] == "rf"
+
+
+def test_estimates_scale_with_rows(selector):
+    measure(selector, "lgbm", 0.0001, rows=1000)
+    measure(selector, "rf", 0.00001, rows=1000)
+
+    # 1000 rows: lgbm ~100 ms, rf ~10 ms
+    assert selector.choose(200, rows=1000)[0] == "lgbm"
+    assert selector.choose(50, rows=1000)[0] == "rf"
+    # Single rows are a different bucket with no samples yet
+    assert selector.choose(50, rows=1)[0] == "lgbm"
+    assert selector.probes == 1